@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import json
 import logging
+from typing import TYPE_CHECKING
 
-from anthropic import Anthropic
+if TYPE_CHECKING:
+    from anthropic import Anthropic
 
 import config
 from bot.accounting.models import Transaction
@@ -21,6 +23,7 @@ def _get_client() -> Anthropic:
     if _client is None:
         if not config.ANTHROPIC_API_KEY:
             raise ValueError("ANTHROPIC_API_KEY not configured")
+        from anthropic import Anthropic  # deferred: only needed once AI parsing runs
         _client = Anthropic(api_key=config.ANTHROPIC_API_KEY)
     return _client
 
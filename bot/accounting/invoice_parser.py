@@ -8,8 +8,10 @@ import logging
 import os
 import tempfile
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from anthropic import Anthropic
+if TYPE_CHECKING:
+    from anthropic import Anthropic
 
 import config
 from bot.accounting.invoice_models import Invoice, InvoiceLineItem, IVABreakdown
@@ -62,6 +64,7 @@ def _get_client() -> Anthropic:
     if _client is None:
         if not config.ANTHROPIC_API_KEY:
             raise ValueError("ANTHROPIC_API_KEY not configured")
+        from anthropic import Anthropic  # deferred: only needed once AI parsing runs
         _client = Anthropic(api_key=config.ANTHROPIC_API_KEY)
     return _client
 
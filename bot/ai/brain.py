@@ -152,14 +152,14 @@ class AIBrain:
             lines.append(f"{i}. {pri_marker}{title} [{cat}]{due_str}")
         return "\n".join(lines)
 
-    def _get_system_prompt(self, tasks, acct_context=None):
+    async def _get_system_prompt(self, tasks, acct_context=None):
         """Build system prompt — personality and context only, NO action definitions."""
         time_ctx = self._get_time_context()
         stats = self._analyze_tasks(tasks)
         task_list = self._build_task_context(tasks)
 
         from bot.services.contacts_store import contacts_store
-        contacts = contacts_store.format_for_prompt()
+        contacts = await contacts_store.format_for_prompt()
 
         situation = []
         if stats["overdue"] > 0:
@@ -230,7 +230,7 @@ Keep it real. No corporate speak. Just be helpful."""
             messages = memory.get_history(chat_id)
             messages.append({"role": "user", "content": user_input})
 
-            system_prompt = self._get_system_prompt(tasks or [], acct_context=acct_context)
+            system_prompt = await self._get_system_prompt(tasks or [], acct_context=acct_context)
 
             # Build tool list (add accounting/invoice tools if session active)
             tools = get_tool_definitions()
@@ -1,4 +1,5 @@
 """Tool definitions and executor for the agent loop."""
+import asyncio
 import json
 import logging
 import tempfile
@@ -465,22 +466,33 @@ async def _exec_complete_tasks(args: dict, chat_id: int) -> dict:
     task_nums = args.get("task_numbers", [])
     tasks = notion_service.get_tasks()
     completed = []
+    not_completed = []
     not_found = []
     undo_entries = []
+    to_complete = []
 
     for num in sorted(set(task_nums), reverse=True):
         if 1 <= num <= len(tasks):
-            task = tasks[num - 1]
-            notion_service.mark_complete(task["id"])
-            completed.append(task["title"])
-            undo_entries.append({"action": "done", "task_id": task["id"], "title": task["title"]})
+            to_complete.append(tasks[num - 1])
         else:
             not_found.append(num)
 
+    failed = set(await asyncio.to_thread(
+        notion_service.mark_complete_many, [task["id"] for task in to_complete]
+    ))
+    for task in to_complete:
+        if task["id"] in failed:
+            not_completed.append(task["title"])
+            continue
+        completed.append(task["title"])
+        undo_entries.append({"action": "done", "task_id": task["id"], "title": task["title"]})
+
     if undo_entries:
         _undo_buffer[chat_id] = undo_entries
 
     result = {"completed": list(reversed(completed))}
+    if not_completed:
+        result["failed"] = list(reversed(not_completed))
     if not_found:
         result["not_found"] = not_found
     return result
@@ -550,7 +562,7 @@ async def _exec_edit_task(args: dict) -> dict:
 
 
 async def _exec_send_email(args: dict, chat_id: int) -> dict:
-    from bot.services.email_service import send_email
+    from bot.services.email_service import send_bulk
     to_raw = args["to"]
     subject = args["subject"]
     body = args["body"]
@@ -559,18 +571,22 @@ async def _exec_send_email(args: dict, chat_id: int) -> dict:
     sent = []
     failed = []
 
-    for rcpt in recipients:
-        success, msg = send_email(rcpt, subject, body)
+    # One SMTP session for all recipients, off the event loop
+    outcomes = await asyncio.to_thread(
+        send_bulk, [{"to": rcpt, "subject": subject, "body": body} for rcpt in recipients]
+    )
+
+    for rcpt, (success, msg) in zip(recipients, outcomes):
         if success:
             sent.append(rcpt)
             # Auto-save contact
             try:
                 from bot.services.contacts_store import contacts_store
-                all_contacts = contacts_store.get_all()
+                all_contacts = await contacts_store.get_all()
                 known = any(c.get("email", "").lower() == rcpt.lower() for c in all_contacts.values())
                 if not known:
                     local = rcpt.split("@")[0].replace(".", " ").replace("_", " ").title()
-                    contacts_store.add_or_update_contact(name=local, email=rcpt, source="auto_email")
+                    await contacts_store.add_or_update_contact(name=local, email=rcpt, source="auto_email")
             except Exception:
                 pass
         else:
@@ -588,7 +604,7 @@ async def _exec_check_inbox(args: dict) -> dict:
     from bot.services.email_inbox import email_inbox
     from bot.handlers.emails import format_inbox
     limit = args.get("limit", 10)
-    messages = email_inbox.get_recent(limit)
+    messages = await asyncio.to_thread(email_inbox.get_recent, limit, prefetch=True)
     return {"inbox": format_inbox(messages), "count": len(messages)}
 
 
@@ -596,7 +612,7 @@ async def _exec_read_email(args: dict) -> dict:
     from bot.services.email_inbox import email_inbox
     from bot.handlers.emails import format_full_email
     num = args["email_number"]
-    msg = email_inbox.get_message_by_num(num)
+    msg = await asyncio.to_thread(email_inbox.get_message_by_num, num)
     if msg:
         return {"email": format_full_email(msg)}
     return {"error": f"Email #{num} not found. Check inbox first."}
@@ -606,7 +622,7 @@ async def _exec_reply_email(args: dict) -> dict:
     from bot.services.email_inbox import email_inbox
     num = args["email_number"]
     body = args["body"]
-    success, msg = email_inbox.reply_by_num(num, body)
+    success, msg = await asyncio.to_thread(email_inbox.reply_by_num, num, body)
     if success:
         return {"success": True, "message": f"Reply sent to email #{num}"}
     return {"error": f"Failed to reply: {msg}"}
@@ -622,7 +638,7 @@ async def _exec_send_whatsapp(args: dict) -> dict:
 
 async def _exec_lookup_contact(args: dict) -> dict:
     from bot.services.contacts_store import contacts_store
-    contact = contacts_store.get_by_name(args["name"])
+    contact = await contacts_store.get_by_name(args["name"])
     if contact:
         return {"found": True, "name": contact.get("name", args["name"]),
                 "email": contact.get("email", ""), "phone": contact.get("phone", "")}
@@ -631,7 +647,7 @@ async def _exec_lookup_contact(args: dict) -> dict:
 
 async def _exec_save_contact(args: dict) -> dict:
     from bot.services.contacts_store import contacts_store
-    success = contacts_store.add_or_update_contact(
+    success = await contacts_store.add_or_update_contact(
         name=args["name"], email=args.get("email", ""),
         phone=args.get("phone", ""), source="manual"
     )
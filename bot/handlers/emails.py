@@ -1,4 +1,5 @@
 """Email inbox handlers - polling job and message formatting."""
+import asyncio
 import logging
 from datetime import datetime, timezone
 from telegram.ext import ContextTypes
@@ -118,7 +119,7 @@ def setup_email_check_job(application, chat_id: int = None):
                 logger.warning("No chat IDs available - can't send notifications")
                 return
 
-            new_messages = email_inbox.get_new_messages()
+            new_messages = await asyncio.to_thread(email_inbox.get_new_messages)
             logger.info(f"Email check found {len(new_messages)} new message(s)")
 
             if not new_messages:
@@ -13,6 +13,14 @@ from telegram.constants import ChatAction
 
 logger = logging.getLogger(__name__)
 
+# Escape table for Telegram's legacy parse_mode="Markdown" entity characters
+_MD_ESCAPE = str.maketrans({c: "\\" + c for c in "_*`["})
+
+
+def escape_md(text: str) -> str:
+    """Escape user text for parse_mode="Markdown" (single C-level translate pass)."""
+    return text.translate(_MD_ESCAPE)
+
 
 def clean_response(text: str) -> str:
     """Strip markdown formatting characters from AI response.
@@ -275,16 +275,27 @@ async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     typing_task = asyncio.create_task(_typing_loop())
 
-    tmp_path = None
     try:
-        # Download the image
+        # Download the image — the temp file is only needed for the base64
+        # read and barcode scan, and is removed when the block closes
         tg_file = await context.bot.get_file(photo_file.file_id)
-        tmp_path = tempfile.mktemp(suffix=file_ext)
-        await tg_file.download_to_drive(tmp_path)
-
-        # Convert to base64
-        with open(tmp_path, "rb") as f:
-            b64_data = base64.standard_b64encode(f.read()).decode("utf-8")
+        barcode = None
+        with tempfile.NamedTemporaryFile(suffix=file_ext) as tmp:
+            await tg_file.download_to_drive(tmp.name)
+
+            # Convert to base64
+            with open(tmp.name, "rb") as f:
+                b64_data = base64.standard_b64encode(f.read()).decode("utf-8")
+
+            # Step 0: Try barcode detection first (fast, offline, no API call)
+            # Only for images, not PDFs (barcodes don't come in PDFs typically)
+            if not is_pdf:
+                barcode = await asyncio.to_thread(_try_detect_barcode, tmp.name)
+
+        if barcode:
+            caption = update.message.caption or ""
+            await _handle_barcode(update, context, user, barcode, caption, chat_id)
+            return
 
         if is_pdf:
             media_type = "application/pdf"
@@ -295,15 +306,6 @@ async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE):
             }
             media_type = media_types.get(file_ext.lower(), "image/jpeg")
 
-        # Step 0: Try barcode detection first (fast, offline, no API call)
-        # Only for images, not PDFs (barcodes don't come in PDFs typically)
-        if not is_pdf:
-            barcode = await asyncio.to_thread(_try_detect_barcode, tmp_path)
-            if barcode:
-                caption = update.message.caption or ""
-                await _handle_barcode(update, context, user, barcode, caption, chat_id)
-                return
-
         # Step 1: Classify the image
         logger.info(f"{'PDF' if is_pdf else 'Photo'} from user {user['id']} — classifying")
         classification = await asyncio.to_thread(
@@ -343,11 +345,6 @@ async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE):
     finally:
         typing_active = False
         typing_task.cancel()
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
 
 
 # ---------------------------------------------------------------------------
@@ -1,4 +1,5 @@
 """Proactive notifications - daily briefing and smart nudges."""
+import asyncio
 import logging
 from datetime import datetime, date, time
 from telegram.ext import ContextTypes
@@ -65,7 +66,7 @@ async def send_daily_briefing(context: ContextTypes.DEFAULT_TYPE):
         try:
             from bot.services.email_inbox import email_inbox
             if email_inbox.is_configured():
-                new_emails = email_inbox.get_new_messages()
+                new_emails = await asyncio.to_thread(email_inbox.get_new_messages)
                 unread_count = len(new_emails)
         except Exception as e:
             logger.warning(f"Could not check emails for briefing: {e}")
@@ -1,10 +1,11 @@
 """Reminder handlers for Telegram bot."""
+import asyncio
 import logging
 import re
 from datetime import datetime, timedelta
 from telegram import Update, Bot
 from telegram.ext import ContextTypes, JobQueue
-from bot.services.notion import notion_service
+from bot.services.notion import notion_service, TaskBotError
 import config
 
 logger = logging.getLogger(__name__)
@@ -161,8 +162,11 @@ async def cmd_remind(update: Update, context: ContextTypes.DEFAULT_TYPE):
         task = tasks[task_num - 1]
         reminder_time = datetime.now() + time_delta
 
-        # Save to Notion (as backup record)
-        notion_service.set_reminder(task["id"], reminder_time)
+        # Save to Notion (as backup record); the job below still fires without it
+        try:
+            notion_service.set_reminder(task["id"], reminder_time)
+        except TaskBotError as e:
+            logger.error(f"Failed to save reminder to Notion: {e}")
 
         # Schedule the actual reminder using run_once() for EXACT timing
         schedule_reminder(
@@ -208,25 +212,33 @@ async def check_reminders(bot: Bot, chat_ids: set = None):
         if not target_chats:
             return
 
-        for task in tasks:
-            # Build reminder notification message
-            priority_icon = "🔴 " if task["priority"] == "High" else ""
-            message = f"⏰ **REMINDER**\n\n{priority_icon}📋 {task['title']}"
-
-            if task["due_date"]:
-                message += f"\n📅 Due: {task['due_date']}"
-
-            message += "\n\n_Reply 'done' to mark complete_"
-
-            # Send to all registered chats
-            for chat_id in target_chats:
-                try:
-                    await bot.send_message(chat_id=chat_id, text=message, parse_mode="Markdown")
-                except Exception as e:
-                    logger.error(f"Failed to send reminder to chat {chat_id}: {type(e).__name__}: {e}")
-
-            # Clear the reminder so it doesn't fire again
-            notion_service.clear_reminder(task["id"])
+        fired = []
+        try:
+            for task in tasks:
+                # Build reminder notification message
+                priority_icon = "🔴 " if task["priority"] == "High" else ""
+                message = f"⏰ **REMINDER**\n\n{priority_icon}📋 {task['title']}"
+
+                if task["due_date"]:
+                    message += f"\n📅 Due: {task['due_date']}"
+
+                message += "\n\n_Reply 'done' to mark complete_"
+
+                # Send to all registered chats
+                for chat_id in target_chats:
+                    try:
+                        await bot.send_message(chat_id=chat_id, text=message, parse_mode="Markdown")
+                    except Exception as e:
+                        logger.error(f"Failed to send reminder to chat {chat_id}: {type(e).__name__}: {e}")
+
+                fired.append(task["id"])
+        finally:
+            # Clear the reminders already sent, even if a later task broke the
+            # loop, so they don't fire again
+            if fired:
+                failed = await asyncio.to_thread(notion_service.clear_reminders, fired)
+                if failed:
+                    logger.warning(f"{len(failed)} reminder(s) not cleared and will fire again: {failed}")
 
     except Exception as e:
         logger.error(f"Error checking reminders: {type(e).__name__}: {e}")
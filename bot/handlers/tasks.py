@@ -1,20 +1,100 @@
 """Task management handlers for Telegram bot."""
 import re
+import asyncio
 import logging
+import functools
 from telegram import Update
 from telegram.ext import ContextTypes
-from bot.services.notion import notion_service
+from bot.services.notion import notion_service, TaskBotError
 from bot.services.classifier import parse_task_input
+from bot.ai.brain import ai_brain, to_ascii
+from bot.ai.tools import _undo_buffer
+from bot.handlers.reminders import register_chat_id, schedule_reminder
+from bot.handlers.message_utils import escape_md
 import config
 
 logger = logging.getLogger(__name__)
 
+# Static command replies — built once at import instead of on every call
+_HELP_TEXT = """*Task Bot Commands*
+
+*Adding Tasks:*
+Just send any message to create a task!
+
+Or use /add <task description>
+
+*Smart Features:*
+- Dates: "tomorrow", "next monday", "in 3 days"
+- Categories: #personal or #business (auto-detected)
+- Priority: !high or !low
+
+*Examples:*
+- Buy groceries tomorrow
+- Call client next monday #business !high
+- Review report in 3 days
+
+*Commands:*
+/add - Add a new task
+/list - Show all pending tasks
+/list personal - Show personal tasks
+/list business - Show business tasks
+/today - Show today's tasks
+/week - Show this week's tasks
+/overdue - Show overdue tasks
+/done <number> - Mark task as complete
+/delete <number> - Delete a task
+/edit <number> <new title> - Edit task
+/remind <number> <time> - Set reminder
+/help - Show this help
+
+*Priority Icons:*
+! = High priority
+~ = Low priority
+
+*Category Icons:*
+[P] = Personal
+[B] = Business"""
+
+_WELCOME_TEXT = """Welcome to Task Bot!
+
+I help you manage your tasks via Telegram. All tasks are saved to your Notion database.
+
+*Quick Start:*
+Just send me a message like:
+"Buy groceries tomorrow"
+
+I'll create a task, auto-detect the category, and set the due date.
+
+Type /help for all commands."""
+
+# Icon lookups shared by the task list renderers
+_PRIORITY_ICON = {"High": "🔴 ", "Low": "⚪ "}
+_CAT_ICON = {"Business": "💼"}
+_TASK_LINE = "{index}. {prio}{cat} {title}{due}\n"
+
+# Allowed Telegram user IDs, snapshotted once for O(1) membership checks
+_ALLOWED = frozenset(config.ALLOWED_USER_IDS or ())
+
+# Feature flags resolved once from config at import
+_HAS_ANTHROPIC = bool(config.ANTHROPIC_API_KEY)
+_AI_SMART = config.AI_MODE == "smart" and _HAS_ANTHROPIC
+
+
+def _task_line(task: dict, due_template: str) -> str:
+    """Render one task row for /week and /overdue from the shared template."""
+    return _TASK_LINE.format_map({
+        "index": task["index"],
+        "prio": _PRIORITY_ICON.get(task["priority"], ""),
+        "cat": _CAT_ICON.get(task["category"], "🏠"),
+        "title": task["title"],
+        "due": due_template.format(task["due_date"]) if task["due_date"] else "",
+    })
+
 
 def is_authorized(user_id: int) -> bool:
     """Check if user is authorized to use the bot."""
-    if not config.ALLOWED_USER_IDS:
-        return True  # No restrictions if not configured
-    return user_id in config.ALLOWED_USER_IDS
+    # No restrictions if not configured
+    return not _ALLOWED or user_id in _ALLOWED
 
 
 def _parse_numbers(text: str) -> list:
@@ -133,7 +213,7 @@ def detect_intent(text: str) -> dict:
 async def handle_ai_message(update: Update, context: ContextTypes.DEFAULT_TYPE, text: str) -> bool:
     """Process message with AI agent. Returns True if handled, False to fallback."""
     try:
-        from bot.ai.brain import ai_brain
+        # accounting pulls in pdfplumber, which is optional — keep it lazy
         from bot.handlers.accounting import get_session_context
         tasks = notion_service.get_tasks()
         acct_context = get_session_context(context)
@@ -168,8 +248,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Sorry, you're not authorized to use this bot.")
         return
 
-    # Register this chat for reminder notifications (lazy import to avoid circular)
-    from bot.handlers.reminders import register_chat_id
+    # Register this chat for reminder notifications
     register_chat_id(update.effective_chat.id)
 
     text = update.message.text.strip()
@@ -177,7 +256,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Use AI mode if enabled
-    if config.AI_MODE == "smart" and config.ANTHROPIC_API_KEY:
+    if _AI_SMART:
         handled = await handle_ai_message(update, context, text)
         if handled:
             return
@@ -221,7 +300,6 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def handle_delete(update: Update, task_nums: list):
     """Delete/remove one or more tasks."""
-    from bot.ai.tools import _undo_buffer
     try:
         tasks = notion_service.get_tasks()
         deleted = []
@@ -242,7 +320,7 @@ async def handle_delete(update: Update, task_nums: list):
 
         parts = []
         if deleted:
-            names = ", ".join(f'"{t}"' for t in reversed(deleted))
+            names = ", ".join(f'"{escape_md(t)}"' for t in reversed(deleted))
             parts.append(f'Deleted: {names}')
         if not_found:
             nums_str = ", ".join(f"#{n}" for n in not_found)
@@ -260,19 +338,27 @@ async def handle_delete(update: Update, task_nums: list):
 
 async def handle_done(update: Update, task_nums: list):
     """Mark one or more tasks as done."""
-    from bot.ai.tools import _undo_buffer
     try:
         tasks = notion_service.get_tasks()
         completed = []
+        not_completed = []
         not_found = []
         undo_entries = []
+        to_complete = []
 
         for num in sorted(set(task_nums), reverse=True):
             if num < 1 or num > len(tasks):
                 not_found.append(num)
                 continue
-            task = tasks[num - 1]
-            notion_service.mark_complete(task["id"])
+            to_complete.append(tasks[num - 1])
+
+        failed = set(await asyncio.to_thread(
+            notion_service.mark_complete_many, [task["id"] for task in to_complete]
+        ))
+        for task in to_complete:
+            if task["id"] in failed:
+                not_completed.append(task["title"])
+                continue
             completed.append(task["title"])
             undo_entries.append({"action": "done", "task_id": task["id"], "title": task["title"]})
 
@@ -283,8 +369,11 @@ async def handle_done(update: Update, task_nums: list):
         # Build response
         parts = []
         if completed:
-            names = ", ".join(f'"{t}"' for t in reversed(completed))
+            names = ", ".join(f'"{escape_md(t)}"' for t in reversed(completed))
             parts.append(f'Done: {names}')
+        if not_completed:
+            names = ", ".join(f'"{escape_md(t)}"' for t in reversed(not_completed))
+            parts.append(f'Failed: {names}')
         if not_found:
             nums_str = ", ".join(f"#{n}" for n in not_found)
             parts.append(f'Not found: {nums_str}')
@@ -301,8 +390,6 @@ async def handle_done(update: Update, task_nums: list):
 
 async def cmd_undo(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Undo the last delete or done action."""
-    from bot.ai.tools import _undo_buffer
-
     if not is_authorized(update.effective_user.id):
         await update.message.reply_text("Sorry, you're not authorized to use this bot.")
         return
@@ -400,7 +487,6 @@ async def add_new_task(update: Update, context: ContextTypes.DEFAULT_TYPE, text:
 
         # Schedule reminder using job_queue.run_once() for EXACT timing
         if parsed.get("reminder_time"):
-            from bot.handlers.reminders import schedule_reminder
             schedule_reminder(
                 job_queue=context.job_queue,
                 chat_id=update.effective_chat.id,
@@ -467,7 +553,6 @@ async def cmd_add(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # Schedule reminder using job_queue.run_once() for EXACT timing
         if parsed.get("reminder_time"):
-            from bot.handlers.reminders import schedule_reminder
             schedule_reminder(
                 job_queue=context.job_queue,
                 chat_id=update.effective_chat.id,
@@ -586,51 +671,53 @@ async def cmd_today(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Error fetching tasks")
 
 
-async def cmd_done(update: Update, context: ContextTypes.DEFAULT_TYPE):
+def _with_task_numbers(usage: str):
+    """Decorator for /done-style commands: auth, usage and number parsing.
+
+    The wrapped handler is called as fn(update, context, nums).
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            if not is_authorized(update.effective_user.id):
+                await update.message.reply_text("Sorry, you're not authorized to use this bot.")
+                return
+
+            if not context.args:
+                await update.message.reply_text(usage)
+                return
+
+            nums = _parse_numbers(" ".join(context.args))
+            if not nums:
+                await update.message.reply_text("Please provide valid task number(s).")
+                return
+
+            await fn(update, context, nums)
+        return wrapper
+    return decorator
+
+
+@_with_task_numbers(
+    "Usage: /done <task numbers>\n\n"
+    "Examples:\n"
+    "  /done 1\n"
+    "  /done 1 3 5\n\n"
+    "Use /list to see task numbers."
+)
+async def cmd_done(update: Update, context: ContextTypes.DEFAULT_TYPE, nums: list):
     """Handle /done command - mark task(s) as complete. Supports multiple: /done 1 3 5"""
-    if not is_authorized(update.effective_user.id):
-        await update.message.reply_text("Sorry, you're not authorized to use this bot.")
-        return
-
-    if not context.args:
-        await update.message.reply_text(
-            "Usage: /done <task numbers>\n\n"
-            "Examples:\n"
-            "  /done 1\n"
-            "  /done 1 3 5\n\n"
-            "Use /list to see task numbers."
-        )
-        return
-
-    nums = _parse_numbers(" ".join(context.args))
-    if not nums:
-        await update.message.reply_text("Please provide valid task number(s).")
-        return
-
     await handle_done(update, nums)
 
 
-async def cmd_delete(update: Update, context: ContextTypes.DEFAULT_TYPE):
+@_with_task_numbers(
+    "Usage: /delete <task numbers>\n\n"
+    "Examples:\n"
+    "  /delete 1\n"
+    "  /delete 1 3 5\n\n"
+    "Use /list to see task numbers."
+)
+async def cmd_delete(update: Update, context: ContextTypes.DEFAULT_TYPE, nums: list):
     """Handle /delete command - remove task(s). Supports multiple: /delete 1 3 5"""
-    if not is_authorized(update.effective_user.id):
-        await update.message.reply_text("Sorry, you're not authorized to use this bot.")
-        return
-
-    if not context.args:
-        await update.message.reply_text(
-            "Usage: /delete <task numbers>\n\n"
-            "Examples:\n"
-            "  /delete 1\n"
-            "  /delete 1 3 5\n\n"
-            "Use /list to see task numbers."
-        )
-        return
-
-    nums = _parse_numbers(" ".join(context.args))
-    if not nums:
-        await update.message.reply_text("Please provide valid task number(s).")
-        return
-
     await handle_delete(update, nums)
 
 
@@ -640,7 +727,7 @@ async def cmd_edit(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Sorry, you're not authorized to use this bot.")
         return
 
-    if len(context.args) < 2:
+    if len(context.args or ()) < 2:
         await update.message.reply_text(
             "Usage: /edit <task number> <new title>\n\n"
             "Example: /edit 1 Buy groceries and milk\n\n"
@@ -654,21 +741,27 @@ async def cmd_edit(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Please provide a valid task number.")
         return
 
-    new_title = " ".join(context.args[1:])
-
     try:
         tasks = notion_service.get_tasks()
+    except Exception as e:
+        logger.error(f"Fetching tasks failed: {type(e).__name__}: {e}")
+        await update.message.reply_text("Error fetching tasks")
+        return
 
-        if task_num < 1 or task_num > len(tasks):
-            await update.message.reply_text(f"Invalid task number. Use /list to see available tasks (1-{len(tasks)}).")
-            return
+    if task_num < 1 or task_num > len(tasks):
+        await update.message.reply_text(f"Invalid task number. Use /list to see available tasks (1-{len(tasks)}).")
+        return
 
-        task = tasks[task_num - 1]
+    task = tasks[task_num - 1]
+    new_title = " ".join(context.args[1:])
+
+    try:
         notion_service.update_task_title(task["id"], new_title)
 
         await update.message.reply_text(f'✏️ Updated: "{task["title"]}" → "{new_title}"')
 
     except Exception as e:
+        logger.error(f"Edit failed: {type(e).__name__}: {e}")
         await update.message.reply_text("Error editing task")
 
 
@@ -685,23 +778,13 @@ async def cmd_week(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await update.message.reply_text("No tasks due this week! 🎉")
             return
 
-        response = "📅 This Week's Tasks:\n\n"
+        parts = ["📅 This Week's Tasks:\n\n"]
+        parts.extend(_task_line(task, " ({})") for task in tasks)
 
-        for task in tasks:
-            priority_icon = ""
-            if task["priority"] == "High":
-                priority_icon = "🔴 "
-            elif task["priority"] == "Low":
-                priority_icon = "⚪ "
-
-            cat_icon = "💼" if task["category"] == "Business" else "🏠"
-            due = f" ({task['due_date']})" if task["due_date"] else ""
+        await update.message.reply_text("".join(parts))
 
-            response += f"{task['index']}. {priority_icon}{cat_icon} {task['title']}{due}\n"
-
-        await update.message.reply_text(response)
-
-    except Exception:
+    except Exception as e:
+        logger.error(f"Week failed: {type(e).__name__}: {e}")
         await update.message.reply_text("Error fetching tasks")
 
 
@@ -718,86 +801,25 @@ async def cmd_overdue(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await update.message.reply_text("No overdue tasks! You're all caught up! ✨")
             return
 
-        response = "⚠️ Overdue Tasks:\n\n"
+        parts = ["⚠️ Overdue Tasks:\n\n"]
+        parts.extend(_task_line(task, " (was due: {})") for task in tasks)
 
-        for task in tasks:
-            priority_icon = ""
-            if task["priority"] == "High":
-                priority_icon = "🔴 "
-            elif task["priority"] == "Low":
-                priority_icon = "⚪ "
-
-            cat_icon = "💼" if task["category"] == "Business" else "🏠"
-            due = f" (was due: {task['due_date']})" if task["due_date"] else ""
-
-            response += f"{task['index']}. {priority_icon}{cat_icon} {task['title']}{due}\n"
+        parts.append("\n💡 Use /done <number> to complete or /delete <number> to remove")
+        await update.message.reply_text("".join(parts))
 
-        response += "\n💡 Use /done <number> to complete or /delete <number> to remove"
-        await update.message.reply_text(response)
-
-    except Exception:
+    except Exception as e:
+        logger.error(f"Overdue failed: {type(e).__name__}: {e}")
         await update.message.reply_text("Error fetching tasks")
 
 
 async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /help command."""
-    help_text = """*Task Bot Commands*
-
-*Adding Tasks:*
-Just send any message to create a task!
-
-Or use /add <task description>
-
-*Smart Features:*
-- Dates: "tomorrow", "next monday", "in 3 days"
-- Categories: #personal or #business (auto-detected)
-- Priority: !high or !low
-
-*Examples:*
-- Buy groceries tomorrow
-- Call client next monday #business !high
-- Review report in 3 days
-
-*Commands:*
-/add - Add a new task
-/list - Show all pending tasks
-/list personal - Show personal tasks
-/list business - Show business tasks
-/today - Show today's tasks
-/week - Show this week's tasks
-/overdue - Show overdue tasks
-/done <number> - Mark task as complete
-/delete <number> - Delete a task
-/edit <number> <new title> - Edit task
-/remind <number> <time> - Set reminder
-/help - Show this help
-
-*Priority Icons:*
-! = High priority
-~ = Low priority
-
-*Category Icons:*
-[P] = Personal
-[B] = Business"""
-
-    await update.message.reply_text(help_text, parse_mode="Markdown")
+    await update.message.reply_text(_HELP_TEXT, parse_mode="Markdown")
 
 
 async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /start command."""
-    welcome = """Welcome to Task Bot!
-
-I help you manage your tasks via Telegram. All tasks are saved to your Notion database.
-
-*Quick Start:*
-Just send me a message like:
-"Buy groceries tomorrow"
-
-I'll create a task, auto-detect the category, and set the due date.
-
-Type /help for all commands."""
-
-    await update.message.reply_text(welcome, parse_mode="Markdown")
+    await update.message.reply_text(_WELCOME_TEXT, parse_mode="Markdown")
 
 
 async def cmd_analyze(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -806,14 +828,15 @@ async def cmd_analyze(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Sorry, you're not authorized to use this bot.")
         return
 
-    if not config.ANTHROPIC_API_KEY:
+    if not _HAS_ANTHROPIC:
         await update.message.reply_text("AI features require ANTHROPIC_API_KEY to be set.")
         return
 
+    import anthropic
+
     await update.message.reply_text("Analyzing your tasks...")
 
     try:
-        from bot.ai.brain import ai_brain, to_ascii
         tasks = notion_service.get_tasks()
 
         if not tasks:
@@ -825,10 +848,12 @@ async def cmd_analyze(update: Update, context: ContextTypes.DEFAULT_TYPE):
         safe_summary = to_ascii(summary) if summary else "Analysis unavailable"
         await update.message.reply_text("TASK ANALYSIS\n\n" + safe_summary)
 
+    except TaskBotError as e:
+        logger.error(f"Analyze failed: {e}")
+        await update.message.reply_text("Analysis error: couldn't reach Notion")
+    except anthropic.APIError as e:
+        logger.error(f"Analyze failed: {type(e).__name__}: {e}")
+        await update.message.reply_text("Analysis error: couldn't reach the AI service")
     except Exception as e:
-        # Safe error message
-        try:
-            error_type = to_ascii(type(e).__name__) or "Unknown"
-        except Exception:
-            error_type = "Unknown"
-        await update.message.reply_text("Analysis error: " + error_type)
+        logger.error(f"Analyze failed: {type(e).__name__}: {e}")
+        await update.message.reply_text("Analysis error: " + (to_ascii(type(e).__name__) or "Unknown"))
@@ -2,7 +2,6 @@
 import asyncio
 import logging
 import os
-import tempfile
 from telegram import Update
 from telegram.ext import ContextTypes
 
@@ -10,6 +9,34 @@ from bot.handlers.message_utils import send_chunked
 
 logger = logging.getLogger(__name__)
 
+GROQ_API_BASE = "https://api.groq.com/openai/v1"
+
+# Shared Groq client (created on first voice note, reused after that) so
+# uploads ride a kept-alive connection instead of a fresh TLS handshake
+_http = None
+
+
+def _get_http():
+    """Return the shared async HTTP client for Groq uploads."""
+    import httpx
+
+    global _http
+    if _http is None or _http.is_closed:
+        _http = httpx.AsyncClient(
+            base_url=GROQ_API_BASE,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _http
+
+
+async def close_http():
+    """Close the shared Groq client (called on application shutdown)."""
+    global _http
+    if _http is not None:
+        await _http.aclose()
+        _http = None
+
 
 def is_voice_configured() -> bool:
     """Check if voice transcription is available."""
@@ -70,15 +97,15 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     typing_task = asyncio.create_task(_typing_loop())
 
-    tmp_path = None
+    text = None
     try:
+        # Download straight into memory — no temp file write + re-read
         voice_file = await context.bot.get_file(voice.file_id)
-        tmp_path = tempfile.mktemp(suffix=".ogg")
-        await voice_file.download_to_drive(tmp_path)
+        audio_bytes = bytes(await voice_file.download_as_bytearray())
 
         logger.info(f"Voice message from user {user['id']} ({voice.duration}s)")
 
-        text, whisper_language = await _transcribe(tmp_path, groq_key)
+        text, whisper_language = await _transcribe(audio_bytes, groq_key)
 
         if not text or not text.strip():
             logger.warning(
@@ -164,28 +191,19 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE):
     finally:
         typing_active = False
         typing_task.cancel()
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
 
 
-async def _transcribe(file_path: str, api_key: str) -> tuple[str, str | None]:
+async def _transcribe(audio_bytes: bytes, api_key: str) -> tuple[str, str | None]:
     """Transcribe audio via Groq Whisper API (async to avoid blocking event loop).
 
-    Returns: (transcribed_text, detected_language_name_or_None)
+    Shared by both voice handlers. Returns: (transcribed_text, detected_language_name_or_None)
     """
-    import httpx
-
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        with open(file_path, "rb") as audio_file:
-            response = await client.post(
-                "https://api.groq.com/openai/v1/audio/transcriptions",
-                headers={"Authorization": f"Bearer {api_key}"},
-                files={"file": ("voice.ogg", audio_file, "audio/ogg")},
-                data={"model": "whisper-large-v3", "response_format": "verbose_json"},
-            )
+    response = await _get_http().post(
+        "/audio/transcriptions",
+        headers={"Authorization": f"Bearer {api_key}"},
+        files={"file": ("voice.ogg", audio_bytes, "audio/ogg")},
+        data={"model": "whisper-large-v3", "response_format": "verbose_json"},
+    )
 
     if response.status_code != 200:
         logger.error(f"Groq Whisper error {response.status_code}: {response.text[:200]}")
@@ -1,4 +1,5 @@
 """Main entry point — webhook or polling mode, multi-user, PostgreSQL."""
+import asyncio
 import html as html_mod
 import sys
 import os
@@ -9,6 +10,7 @@ import json
 import urllib.request
 import urllib.error
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
 from telegram import Update, BotCommand
@@ -35,20 +37,31 @@ logger = logging.getLogger(__name__)
 
 def _notify_admin(msg: str):
     """Send a Telegram message to admin using raw urllib (no deps needed).
-    Used for startup telemetry so we can debug Railway remotely."""
+    Used for startup telemetry so we can debug Railway remotely.
+
+    All admins are messaged in parallel, so boot waits for one round-trip
+    instead of one per admin, and one bad ID no longer blocks the rest."""
     try:
         token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
         admin_ids = os.environ.get("ADMIN_USER_IDS", "1631254047")  # Fallback to owner
         if not token:
             return
-        for uid in admin_ids.split(","):
-            uid = uid.strip()
-            if not uid:
-                continue
-            url = f"https://api.telegram.org/bot{token}/sendMessage"
+        uids = [uid.strip() for uid in admin_ids.split(",") if uid.strip()]
+        if not uids:
+            return
+        url = f"https://api.telegram.org/bot{token}/sendMessage"
+
+        def _send(uid: str):
             data = json.dumps({"chat_id": int(uid), "text": msg, "parse_mode": "HTML"}).encode()
             req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
             urllib.request.urlopen(req, timeout=10)
+
+        with ThreadPoolExecutor(max_workers=len(uids)) as pool:
+            for uid, future in [(uid, pool.submit(_send, uid)) for uid in uids]:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.warning(f"Admin notify failed for {uid}: {type(e).__name__}")
     except Exception:
         pass  # Telemetry must never crash the bot
 
@@ -824,6 +837,28 @@ async def _post_init(application):
         logger.error(f"Failed to set bot commands: {type(e).__name__}: {e}")
 
 
+async def _post_shutdown(application):
+    """Release shared HTTP clients on shutdown."""
+    try:
+        from bot.handlers.voice_v2 import close_http as close_voice_http
+        await close_voice_http()
+    except Exception as e:
+        logger.error(f"Failed to close voice HTTP client: {type(e).__name__}: {e}")
+    try:
+        from bot.services.contacts_store import contacts_store
+        await contacts_store.close()
+    except Exception as e:
+        logger.error(f"Failed to close contacts HTTP client: {type(e).__name__}: {e}")
+
+
+async def _error_handler(update: object, context: ContextTypes.DEFAULT_TYPE):
+    """Log exceptions that handlers let propagate instead of swallowing."""
+    logger.error(
+        f"Unhandled error in handler: {type(context.error).__name__}: {context.error}",
+        exc_info=context.error,
+    )
+
+
 async def _fallback_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Fallback /start when DB is not available."""
     await update.message.reply_text(
@@ -901,12 +936,22 @@ def main():
     # Build app
     logger.info("Building application...")
     try:
-        application = Application.builder().token(bot_token).post_init(_post_init).build()
+        application = (
+            Application.builder()
+            .token(bot_token)
+            # Handler replies share one multiplexed connection; getUpdates stays on HTTP/1.1
+            .http_version("2")
+            .post_init(_post_init)
+            .post_shutdown(_post_shutdown)
+            .build()
+        )
         logger.info("Application built")
     except Exception as e:
         _notify_admin(f"🔴 <b>Stage 2 FAILED</b>: Application.build() crashed\n<code>{type(e).__name__}: {e}</code>")
         raise
 
+    application.add_error_handler(_error_handler)
+
     # Try to initialize PostgreSQL (with retry for transient failures)
     db_url = os.environ.get("DATABASE_URL")
     if db_url:
@@ -987,6 +1032,14 @@ def main():
 
     # --- Start ---
 
+    # Use uvloop's libuv-based event loop when available (Linux/macOS) — less
+    # per-callback overhead for the I/O-heavy update loop
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass  # uvloop not installed; default asyncio loop
+
     try:
         if use_webhook and webhook_domain:
             # Webhook mode — only if BOT_MODE=webhook is explicitly set
@@ -1010,9 +1063,11 @@ def main():
             logger.info("Starting POLLING mode")
             _startup_status = "running (polling)"
 
+            # Long-poll for 20s so an idle bot makes a few getUpdates calls a minute
             application.run_polling(
                 allowed_updates=["message", "callback_query", "pre_checkout_query"],
                 drop_pending_updates=True,
+                timeout=20,
             )
     except Exception as e:
         import traceback
@@ -1026,6 +1081,12 @@ def main():
             time.sleep(60)
 
 
+def _add_commands(application, commands):
+    """Register a table of (command, callback) pairs as CommandHandlers."""
+    for name, callback in commands:
+        application.add_handler(CommandHandler(name, callback))
+
+
 def _register_full_handlers(application):
     """Register all handlers (requires DB)."""
     _text_handler = None
@@ -1037,16 +1098,18 @@ def _register_full_handlers(application):
             cmd_calendar, cmd_google, cmd_referral, cmd_memory,
             handle_onboarding_callback, handle_location, handle_contact,
         )
-        application.add_handler(CommandHandler("start", cmd_start))
-        application.add_handler(CommandHandler("referral", cmd_referral))
-        application.add_handler(CommandHandler("refer", cmd_referral))
-        application.add_handler(CommandHandler("memory", cmd_memory))
-        application.add_handler(CommandHandler("help", cmd_help))
-        application.add_handler(CommandHandler("settings", cmd_settings))
-        application.add_handler(CommandHandler("account", cmd_account))
-        application.add_handler(CommandHandler("calendar", cmd_calendar))
-        application.add_handler(CommandHandler("google", cmd_google))
-        application.add_handler(CommandHandler("deleteaccount", cmd_delete_account))
+        _add_commands(application, (
+            ("start", cmd_start),
+            ("referral", cmd_referral),
+            ("refer", cmd_referral),
+            ("memory", cmd_memory),
+            ("help", cmd_help),
+            ("settings", cmd_settings),
+            ("account", cmd_account),
+            ("calendar", cmd_calendar),
+            ("google", cmd_google),
+            ("deleteaccount", cmd_delete_account),
+        ))
         # Pattern-specific callbacks must be registered BEFORE the catch-all onboarding handler
         try:
             from bot.handlers.tasks_v2 import handle_whoop_callback
@@ -1107,30 +1170,32 @@ def _register_full_handlers(application):
             cmd_connect_whoop, cmd_recovery, cmd_whoop, cmd_disconnect_whoop,
             handle_whoop_callback, handle_feedback_callback, handle_message,
         )
-        application.add_handler(CommandHandler("add", cmd_add))
-        application.add_handler(CommandHandler("list", cmd_list))
-        application.add_handler(CommandHandler("today", cmd_today))
-        application.add_handler(CommandHandler("week", cmd_week))
-        application.add_handler(CommandHandler("overdue", cmd_overdue))
-        application.add_handler(CommandHandler("done", cmd_done))
-        application.add_handler(CommandHandler("delete", cmd_delete))
-        application.add_handler(CommandHandler("edit", cmd_edit))
-        application.add_handler(CommandHandler("undo", cmd_undo))
-        application.add_handler(CommandHandler("clear", cmd_clear))
-        application.add_handler(CommandHandler("analyze", cmd_analyze))
-        application.add_handler(CommandHandler("streak", cmd_streak))
-        application.add_handler(CommandHandler("workout", cmd_workout))
-        application.add_handler(CommandHandler("wtest", cmd_wtest))
-        application.add_handler(CommandHandler("metrics", cmd_metrics))
-        application.add_handler(CommandHandler("gains", cmd_gains))
-        application.add_handler(CommandHandler("protocols", cmd_protocols))
-        application.add_handler(CommandHandler("supplements", cmd_supplements))
-        application.add_handler(CommandHandler("bloodwork", cmd_bloodwork))
-        application.add_handler(CommandHandler("dose", cmd_dose))
-        application.add_handler(CommandHandler("connect_whoop", cmd_connect_whoop))
-        application.add_handler(CommandHandler("recovery", cmd_recovery))
-        application.add_handler(CommandHandler("whoop", cmd_whoop))
-        application.add_handler(CommandHandler("disconnect_whoop", cmd_disconnect_whoop))
+        _add_commands(application, (
+            ("add", cmd_add),
+            ("list", cmd_list),
+            ("today", cmd_today),
+            ("week", cmd_week),
+            ("overdue", cmd_overdue),
+            ("done", cmd_done),
+            ("delete", cmd_delete),
+            ("edit", cmd_edit),
+            ("undo", cmd_undo),
+            ("clear", cmd_clear),
+            ("analyze", cmd_analyze),
+            ("streak", cmd_streak),
+            ("workout", cmd_workout),
+            ("wtest", cmd_wtest),
+            ("metrics", cmd_metrics),
+            ("gains", cmd_gains),
+            ("protocols", cmd_protocols),
+            ("supplements", cmd_supplements),
+            ("bloodwork", cmd_bloodwork),
+            ("dose", cmd_dose),
+            ("connect_whoop", cmd_connect_whoop),
+            ("recovery", cmd_recovery),
+            ("whoop", cmd_whoop),
+            ("disconnect_whoop", cmd_disconnect_whoop),
+        ))
         _text_handler = MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message)
         logger.info("Task + fitness + biohacking + WHOOP handlers registered")
     except Exception as e:
@@ -1143,10 +1208,12 @@ def _register_full_handlers(application):
             handle_pre_checkout, handle_successful_payment,
             cmd_terms, cmd_support,
         )
-        application.add_handler(CommandHandler("upgrade", cmd_upgrade))
-        application.add_handler(CommandHandler("billing", cmd_billing))
-        application.add_handler(CommandHandler("terms", cmd_terms))
-        application.add_handler(CommandHandler("support", cmd_support))
+        _add_commands(application, (
+            ("upgrade", cmd_upgrade),
+            ("billing", cmd_billing),
+            ("terms", cmd_terms),
+            ("support", cmd_support),
+        ))
         application.add_handler(PreCheckoutQueryHandler(handle_pre_checkout))
         application.add_handler(MessageHandler(filters.SUCCESSFUL_PAYMENT, handle_successful_payment))
         logger.info("Payment handlers registered")
@@ -1156,9 +1223,11 @@ def _register_full_handlers(application):
     # Admin
     try:
         from bot.handlers.admin import cmd_migrate_notion, cmd_diagnostics, cmd_audit
-        application.add_handler(CommandHandler("migrate", cmd_migrate_notion))
-        application.add_handler(CommandHandler("diagnostics", cmd_diagnostics))
-        application.add_handler(CommandHandler("audit", cmd_audit))
+        _add_commands(application, (
+            ("migrate", cmd_migrate_notion),
+            ("diagnostics", cmd_diagnostics),
+            ("audit", cmd_audit),
+        ))
         logger.info("Admin handlers registered")
     except Exception as e:
         logger.error(f"Failed to register admin handlers: {type(e).__name__}: {e}")
@@ -1,5 +1,6 @@
 """Keyword-based task classifier for categorization and parsing."""
 import re
+from functools import lru_cache
 from datetime import datetime, timedelta, date
 from typing import Optional, Tuple
 from dateutil import parser as date_parser
@@ -26,6 +27,16 @@ PERSONAL_KEYWORDS = [
     "shop", "buy", "personal", "self", "health", "wellness"
 ]
 
+# Single-pass keyword matcher: one lookahead alternation (longest keyword
+# first) finds the longest keyword starting at each position in one C-level
+# scan. Shorter keywords contained in a hit ("work" in "workout") are added
+# back from _IMPLIED_KEYWORDS, so the hit set equals the substring checks.
+_BUSINESS_SET = frozenset(BUSINESS_KEYWORDS)
+_PERSONAL_SET = frozenset(PERSONAL_KEYWORDS)
+_ALL_KEYWORDS = sorted(_BUSINESS_SET | _PERSONAL_SET, key=len, reverse=True)
+_KEYWORD_RE = re.compile("(?=(" + "|".join(map(re.escape, _ALL_KEYWORDS)) + "))")
+_IMPLIED_KEYWORDS = {kw: frozenset(k for k in _ALL_KEYWORDS if k in kw) for kw in _ALL_KEYWORDS}
+
 # Day name mappings for date parsing
 WEEKDAY_MAP = {
     "monday": MO, "mon": MO,
@@ -37,7 +48,78 @@ WEEKDAY_MAP = {
     "sunday": SU, "sun": SU
 }
 
-
+# Precompiled patterns (IGNORECASE baked in) so parsing never hits re's cache lookup
+# Tags in precedence order: when several are present the earliest one in
+# this list wins, regardless of where it appears in the text.
+_PRIORITY_TAGS = {
+    "high": "High",
+    "urgent": "High",
+    "low": "Low",
+    "medium": "Medium",
+    "med": "Medium",
+}
+_PRIORITY_RE = re.compile(r"!(?P<p>high|urgent|low|medium|med)\b", re.IGNORECASE)
+
+# All relative-date keywords in one pattern; the group name says which one hit.
+# "day after tomorrow" comes first so it is not read as plain "tomorrow".
+_DATE_KEYWORD_RE = re.compile(
+    r"\b(?:(?P<day_after_tomorrow>day after tomorrow)|(?P<today>today)|(?P<tomorrow>tomorrow)"
+    r"|(?P<next_week>next week)|(?P<next_month>next month)"
+    r"|next\s+(?P<weekday>monday|mon|tuesday|tue|tues|wednesday|wed|thursday|thu|thur|thurs"
+    r"|friday|fri|saturday|sat|sunday|sun))\b",
+    re.IGNORECASE,
+)
+# Offsets in precedence order: when several keywords are present the
+# earliest one in this table wins, with "next <weekday>" last.
+_DATE_KEYWORD_OFFSETS = {
+    "today": timedelta(),
+    "tomorrow": timedelta(days=1),
+    "day_after_tomorrow": timedelta(days=2),
+    "next_week": timedelta(weeks=1),
+    "next_month": relativedelta(months=1),
+}
+_IN_X_RE = re.compile(r"\bin\s+(\d+)\s+(days?|weeks?|months?)\b", re.IGNORECASE)
+_ON_DATE_RE = re.compile(r"\bon\s+([a-zA-Z0-9\s,]+?)(?:\s*$|\s+(?:at|by|for))", re.IGNORECASE)
+
+# Common "on <date>" spellings, tried with strptime before falling back to
+# dateutil's much slower fuzzy parser. Formats without a year get the
+# current year, as dateutil would.
+_ON_DATE_FORMATS = (
+    ("%b %d", False),
+    ("%B %d", False),
+    ("%d %b", False),
+    ("%d %B", False),
+    ("%b %d %Y", True),
+    ("%B %d %Y", True),
+    ("%b %d, %Y", True),
+    ("%B %d, %Y", True),
+    ("%d %b %Y", True),
+    ("%d %B %Y", True),
+)
+
+# Possessive quantifiers (Python 3.11+) stop the two \s* runs around the
+# optional "me" from trading whitespace back and forth, which made a long
+# run of spaces after "remind" quadratic to reject.
+_REMIND_AT_RE = re.compile(
+    r"remind(?:er)?+\s*+(?:me)?+\s*+at\s++(\d{1,2})(?::(\d{2}))?+\s*+(am|pm)?+", re.IGNORECASE
+)
+_REMIND_IN_RE = re.compile(
+    r"remind(?:er)?+\s*+(?:me)?+\s*+in\s++(\d++)\s*+(hours?|minutes?|mins?|hrs?)", re.IGNORECASE
+)
+_REMIND_BARE_RE = re.compile(r"\bremind(?:er)?\s*(?:me)?\b(?!\s*(?:at|in))", re.IGNORECASE)
+_REMIND_WORD_RE = re.compile(r"\bremind(?:er)?\s*(?:me)?\b", re.IGNORECASE)
+_TRAILING_AND_RE = re.compile(r"\band\s*$", re.IGNORECASE)
+
+_HASHTAG_RE = re.compile(r"[#@](personal|business)\b", re.IGNORECASE)
+# Category override tags; matched as substrings, like the keywords
+_CATEGORY_TAG_RE = re.compile(r"[#@](business|personal)")
+_CMD_PREFIX_RE = re.compile(r"^(add|create|new|make|set|schedule)\s+", re.IGNORECASE)
+_REMIND_PREFIX_RE = re.compile(r"^remind\s*(?:me)?\s*(?:to|about)?\s+", re.IGNORECASE)
+_LEADING_AND_RE = re.compile(r"^\s*and\s+", re.IGNORECASE)
+_TITLE_TRAILING_AND_RE = re.compile(r"\s+and\s*$", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
 def classify_task(text: str) -> str:
     """
     Classify a task as 'Personal' or 'Business' based on keywords.
@@ -47,15 +129,19 @@ def classify_task(text: str) -> str:
     """
     text_lower = text.lower()
 
-    # Check for explicit hashtags first (highest priority)
-    if "#business" in text_lower or "@business" in text_lower:
+    # Check for explicit hashtags first (highest priority; business beats personal)
+    tags = set(_CATEGORY_TAG_RE.findall(text_lower))
+    if "business" in tags:
         return "Business"
-    if "#personal" in text_lower or "@personal" in text_lower:
+    if "personal" in tags:
         return "Personal"
 
-    # Count keyword matches
-    business_count = sum(1 for kw in BUSINESS_KEYWORDS if kw in text_lower)
-    personal_count = sum(1 for kw in PERSONAL_KEYWORDS if kw in text_lower)
+    # Count distinct keyword matches in one pass over the text
+    hits = set()
+    for match in _KEYWORD_RE.finditer(text_lower):
+        hits |= _IMPLIED_KEYWORDS[match.group(1)]
+    business_count = len(hits & _BUSINESS_SET)
+    personal_count = len(hits & _PERSONAL_SET)
 
     # Return based on which has more matches
     if business_count > personal_count:
@@ -63,30 +149,57 @@ def classify_task(text: str) -> str:
     return "Personal"
 
 
+def _cut(pattern: "re.Pattern[str]", text: str) -> Tuple[Optional["re.Match[str]"], str]:
+    """
+    Remove every match of pattern from text in a single scan.
+
+    Returns (first_match, cleaned_text); the text is unchanged and the match
+    is None when nothing matched. Equivalent to search() followed by sub("").
+    """
+    matches = list(pattern.finditer(text))
+    if not matches:
+        return None, text
+    return matches[0], _splice(text, matches)
+
+
+def _splice(text: str, matches: list) -> str:
+    """Return text with the given non-overlapping matches removed."""
+    pieces = []
+    last = 0
+    for match in matches:
+        pieces.append(text[last:match.start()])
+        last = match.end()
+    pieces.append(text[last:])
+    return "".join(pieces)
+
+
 def extract_priority(text: str) -> Tuple[str, str]:
     """
     Extract priority from text and return (priority, cleaned_text).
 
     Supports: !high, !low, !urgent, !medium
     """
-    priority = "Medium"
-    cleaned = text
+    found = {m.group("p").lower() for m in _PRIORITY_RE.finditer(text)}
+    if not found:
+        return "Medium", text.strip()
 
-    priority_patterns = {
-        r"!high\b": "High",
-        r"!urgent\b": "High",
-        r"!low\b": "Low",
-        r"!medium\b": "Medium",
-        r"!med\b": "Medium"
-    }
+    tag = next(t for t in _PRIORITY_TAGS if t in found)
+    cleaned = _PRIORITY_RE.sub(
+        lambda m: "" if m.group("p").lower() == tag else m.group(0), text
+    )
+    return _PRIORITY_TAGS[tag], cleaned.strip()
 
-    for pattern, prio in priority_patterns.items():
-        if re.search(pattern, text, re.IGNORECASE):
-            priority = prio
-            cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE)
-            break
 
-    return priority, cleaned.strip()
+def _parse_on_date(value: str, today: date) -> date:
+    """Parse the text after "on", trying known formats before dateutil."""
+    value = value.strip()
+    for fmt, has_year in _ON_DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return parsed.date() if has_year else parsed.date().replace(year=today.year)
+    return date_parser.parse(value, fuzzy=True).date()
 
 
 def extract_date(text: str) -> Tuple[Optional[date], str]:
@@ -99,67 +212,52 @@ def extract_date(text: str) -> Tuple[Optional[date], str]:
     - "in 3 days", "in 2 weeks"
     - Explicit dates like "jan 15", "2024-01-15"
     """
-    text_lower = text.lower()
-    today = date.today()
+    return _extract_date(text, date.today())
+
+
+@lru_cache(maxsize=1024)
+def _extract_date(text: str, today: date) -> Tuple[Optional[date], str]:
+    """Cached body of extract_date; keyed on today so results roll over at midnight."""
     extracted_date = None
     cleaned = text
 
-    # Pattern: "today"
-    if re.search(r"\btoday\b", text_lower):
-        extracted_date = today
-        cleaned = re.sub(r"\btoday\b", "", cleaned, flags=re.IGNORECASE)
-
-    # Pattern: "tomorrow"
-    elif re.search(r"\btomorrow\b", text_lower):
-        extracted_date = today + timedelta(days=1)
-        cleaned = re.sub(r"\btomorrow\b", "", cleaned, flags=re.IGNORECASE)
-
-    # Pattern: "day after tomorrow"
-    elif re.search(r"\bday after tomorrow\b", text_lower):
-        extracted_date = today + timedelta(days=2)
-        cleaned = re.sub(r"\bday after tomorrow\b", "", cleaned, flags=re.IGNORECASE)
-
-    # Pattern: "next week"
-    elif re.search(r"\bnext week\b", text_lower):
-        extracted_date = today + timedelta(weeks=1)
-        cleaned = re.sub(r"\bnext week\b", "", cleaned, flags=re.IGNORECASE)
-
-    # Pattern: "next month"
-    elif re.search(r"\bnext month\b", text_lower):
-        extracted_date = today + relativedelta(months=1)
-        cleaned = re.sub(r"\bnext month\b", "", cleaned, flags=re.IGNORECASE)
-
-    # Pattern: "next [weekday]"
-    else:
-        weekday_match = re.search(r"\bnext\s+(monday|mon|tuesday|tue|tues|wednesday|wed|thursday|thu|thur|thurs|friday|fri|saturday|sat|sunday|sun)\b", text_lower)
-        if weekday_match:
-            day_name = weekday_match.group(1)
-            weekday = WEEKDAY_MAP.get(day_name)
-            if weekday:
-                extracted_date = today + relativedelta(weekday=weekday(+1))
-                cleaned = re.sub(r"\bnext\s+" + day_name + r"\b", "", cleaned, flags=re.IGNORECASE)
+    # Patterns: "today", "tomorrow", "day after tomorrow", "next week",
+    # "next month", "next [weekday]" - one scan, then dispatch on the group
+    keyword_matches = list(_DATE_KEYWORD_RE.finditer(cleaned))
+    if keyword_matches:
+        found = {m.lastgroup for m in keyword_matches}
+        kind = next((k for k in _DATE_KEYWORD_OFFSETS if k in found), "weekday")
+        if kind == "weekday":
+            # Only strip "next <day>" for the same spelling of the day
+            day_name = keyword_matches[0].group("weekday").lower()
+            extracted_date = today + relativedelta(weekday=WEEKDAY_MAP[day_name](+1))
+            keyword_matches = [
+                m for m in keyword_matches if (m.group("weekday") or "").lower() == day_name
+            ]
+        else:
+            extracted_date = today + _DATE_KEYWORD_OFFSETS[kind]
+            keyword_matches = [m for m in keyword_matches if m.lastgroup == kind]
+        cleaned = _splice(cleaned, keyword_matches)
 
     # Pattern: "in X days/weeks/months"
     if not extracted_date:
-        in_match = re.search(r"\bin\s+(\d+)\s+(days?|weeks?|months?)\b", text_lower)
+        in_match, cleaned = _cut(_IN_X_RE, cleaned)
         if in_match:
             amount = int(in_match.group(1))
-            unit = in_match.group(2)
+            unit = in_match.group(2).lower()
             if "day" in unit:
                 extracted_date = today + timedelta(days=amount)
             elif "week" in unit:
                 extracted_date = today + timedelta(weeks=amount)
             elif "month" in unit:
                 extracted_date = today + relativedelta(months=amount)
-            cleaned = re.sub(r"\bin\s+\d+\s+(days?|weeks?|months?)\b", "", cleaned, flags=re.IGNORECASE)
 
     # Pattern: "on [date]" - try to parse with dateutil
     if not extracted_date:
-        on_match = re.search(r"\bon\s+([a-zA-Z0-9\s,]+?)(?:\s*$|\s+(?:at|by|for))", text_lower)
+        on_match = _ON_DATE_RE.search(cleaned)
         if on_match:
             try:
-                parsed = date_parser.parse(on_match.group(1), fuzzy=True)
-                extracted_date = parsed.date()
+                extracted_date = _parse_on_date(on_match.group(1).lower(), today)
                 cleaned = re.sub(r"\bon\s+" + re.escape(on_match.group(1)), "", cleaned, flags=re.IGNORECASE)
             except (ValueError, TypeError):
                 pass
@@ -179,17 +277,15 @@ def extract_reminder(text: str) -> Tuple[Optional[datetime], str]:
     - "remind me in 2 hours", "remind me in 30 minutes"
     - "reminder at 5pm", "reminder in 1 hour"
     """
-    text_lower = text.lower()
     now = datetime.now()
     reminder_time = None
-    cleaned = text
 
     # Pattern: "remind(er)? (me)? at [time]"
-    at_time_match = re.search(r"remind(?:er)?\s*(?:me)?\s*at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)?", text_lower)
+    at_time_match, cleaned = _cut(_REMIND_AT_RE, text)
     if at_time_match:
         hour = int(at_time_match.group(1))
         minute = int(at_time_match.group(2)) if at_time_match.group(2) else 0
-        ampm = at_time_match.group(3)
+        ampm = (at_time_match.group(3) or "").lower()
 
         if ampm == "pm" and hour < 12:
             hour += 12
@@ -202,36 +298,47 @@ def extract_reminder(text: str) -> Tuple[Optional[datetime], str]:
         if reminder_time <= now:
             reminder_time += timedelta(days=1)
 
-        cleaned = re.sub(r"remind(?:er)?\s*(?:me)?\s*at\s+\d{1,2}(?::\d{2})?\s*(?:am|pm)?", "", cleaned, flags=re.IGNORECASE)
-
     # Pattern: "remind(er)? (me)? in X hours/minutes"
     if not reminder_time:
-        in_time_match = re.search(r"remind(?:er)?\s*(?:me)?\s*in\s+(\d+)\s*(hours?|minutes?|mins?|hrs?)", text_lower)
+        in_time_match, cleaned = _cut(_REMIND_IN_RE, cleaned)
         if in_time_match:
             amount = int(in_time_match.group(1))
-            unit = in_time_match.group(2)
+            unit = in_time_match.group(2).lower()
 
             if "hour" in unit or "hr" in unit:
                 reminder_time = now + timedelta(hours=amount)
             else:  # minutes
                 reminder_time = now + timedelta(minutes=amount)
 
-            cleaned = re.sub(r"remind(?:er)?\s*(?:me)?\s*in\s+\d+\s*(?:hours?|minutes?|mins?|hrs?)", "", cleaned, flags=re.IGNORECASE)
-
     # Pattern: just "remind me" without time - default to 1 hour
     if not reminder_time:
-        simple_remind = re.search(r"\bremind(?:er)?\s*(?:me)?\b(?!\s*(?:at|in))", text_lower)
+        simple_remind = _REMIND_BARE_RE.search(cleaned)
         if simple_remind:
             reminder_time = now + timedelta(hours=1)
-            cleaned = re.sub(r"\bremind(?:er)?\s*(?:me)?\b", "", cleaned, flags=re.IGNORECASE)
+            cleaned = _REMIND_WORD_RE.sub("", cleaned)
 
     # Clean up "and" that might be left over
-    cleaned = re.sub(r"\band\s*$", "", cleaned, flags=re.IGNORECASE)
+    cleaned = _TRAILING_AND_RE.sub("", cleaned)
     cleaned = " ".join(cleaned.split())
 
     return reminder_time, cleaned.strip()
 
 
+@lru_cache(maxsize=1024)
+def _strip_and_prioritize(text: str) -> Tuple[str, str]:
+    """Strip tags and command prefixes, then pull out the priority."""
+    # Remove hashtags from the final title
+    cleaned = _HASHTAG_RE.sub("", text)
+
+    # Remove command words from the beginning
+    cleaned = _CMD_PREFIX_RE.sub("", cleaned)
+
+    # Remove "remind me to/about" patterns (keep the actual task)
+    cleaned = _REMIND_PREFIX_RE.sub("", cleaned)
+
+    return extract_priority(cleaned)
+
+
 def parse_task_input(text: str) -> dict:
     """
     Parse a task input string and extract all components.
@@ -243,24 +350,16 @@ def parse_task_input(text: str) -> dict:
     - due_date: date object or None
     - reminder_time: datetime object or None
     """
-    # Remove hashtags from the final title
-    cleaned = re.sub(r"[#@](personal|business)\b", "", text, flags=re.IGNORECASE)
-
-    # Remove command words from the beginning
-    cleaned = re.sub(r"^(add|create|new|make|set|schedule)\s+", "", cleaned, flags=re.IGNORECASE)
-
-    # Remove "remind me to/about" patterns (keep the actual task)
-    cleaned = re.sub(r"^remind\s*(?:me)?\s*(?:to|about)?\s+", "", cleaned, flags=re.IGNORECASE)
+    priority, cleaned = _strip_and_prioritize(text)
 
-    # Extract components
-    priority, cleaned = extract_priority(cleaned)
+    # Reminder times are relative to now, so this step is never cached
     reminder_time, cleaned = extract_reminder(cleaned)
     due_date, cleaned = extract_date(cleaned)
     category = classify_task(text)  # Use original text for classification
 
     # Final cleanup - remove leftover "and" at start/end
-    cleaned = re.sub(r"^\s*and\s+", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r"\s+and\s*$", "", cleaned, flags=re.IGNORECASE)
+    cleaned = _LEADING_AND_RE.sub("", cleaned)
+    cleaned = _TITLE_TRAILING_AND_RE.sub("", cleaned)
 
     return {
         "title": cleaned.strip(),
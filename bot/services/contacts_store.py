@@ -1,7 +1,9 @@
 """Contact store service - persistent contacts via Notion with in-memory cache."""
 from __future__ import annotations
+import re
 import time
 import logging
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 import httpx
 import config
@@ -9,6 +11,11 @@ import config
 logger = logging.getLogger(__name__)
 
 CACHE_TTL_SECONDS = 300  # 5 minutes
+FULL_REFRESH_SECONDS = 3600  # full reload picks up deleted contacts
+NOTION_API_BASE = "https://api.notion.com/v1"
+
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_PHONE_RE = re.compile(r"^\+?[\d\s\-()]{5,}$")
 
 
 class ContactsStore:
@@ -18,20 +25,24 @@ class ContactsStore:
         self._cache: dict[str, dict] = {}
         self._cache_timestamp: float = 0
         self._seed_loaded: bool = False
+        self._edited_since: Optional[str] = None
+        self._last_full_refresh: float = 0
+        self._prompt: Optional[str] = None  # format_for_prompt result, None when stale
+        self._http: Optional[httpx.AsyncClient] = None
 
-    def get_all(self) -> dict[str, dict]:
+    async def get_all(self) -> dict[str, dict]:
         """Return all contacts as {name_lower: {name, email, phone, source}}."""
-        self._ensure_cache()
+        await self._ensure_cache()
         return dict(self._cache)
 
-    def get_by_name(self, name: str) -> Optional[dict]:
+    async def get_by_name(self, name: str) -> Optional[dict]:
         """Look up a single contact by name (case-insensitive)."""
-        self._ensure_cache()
+        await self._ensure_cache()
         return self._cache.get(name.strip().lower())
 
-    def add_or_update_contact(self, name: str, email: str = "", phone: str = "", source: str = "manual") -> bool:
+    async def add_or_update_contact(self, name: str, email: str = "", phone: str = "", source: str = "manual") -> bool:
         """Add a new contact or update an existing one. Returns True on success."""
-        self._ensure_cache()
+        await self._ensure_cache()
         name_lower = name.strip().lower()
         existing = self._cache.get(name_lower)
 
@@ -47,34 +58,41 @@ class ContactsStore:
 
             if config.NOTION_CONTACTS_DB_ID and existing.get("page_id"):
                 try:
-                    self._update_notion_page(existing["page_id"], **updates)
+                    await self._update_notion_page(existing["page_id"], **updates)
                 except Exception as e:
                     logger.warning(f"Failed to update contact in Notion: {e}")
                     return False
 
             self._cache[name_lower].update(updates)
+            self._prompt = None
             return True
         else:
             contact = {"name": name.strip().title(), "email": email, "phone": phone, "source": source}
 
             if config.NOTION_CONTACTS_DB_ID:
                 try:
-                    page = self._create_notion_page(contact["name"], email, phone, source)
+                    page = await self._create_notion_page(contact["name"], email, phone, source)
                     contact["page_id"] = page["id"]
                 except Exception as e:
                     logger.error(f"Failed to create contact in Notion: {type(e).__name__}: {e}")
                     return False
 
             self._cache[name_lower] = contact
+            self._prompt = None
             return True
 
-    def format_for_prompt(self) -> str:
+    async def format_for_prompt(self) -> str:
         """Format all contacts as a string for the AI system prompt."""
-        contacts = self.get_all()
-        if not contacts:
+        await self._ensure_cache()
+        if self._prompt is None:
+            self._prompt = self._build_prompt()
+        return self._prompt
+
+    def _build_prompt(self) -> str:
+        if not self._cache:
             return "No saved contacts yet."
         lines = []
-        for key, c in contacts.items():
+        for key, c in self._cache.items():
             parts = [c.get("name", key)]
             if c.get("email"):
                 parts.append(c["email"])
@@ -83,23 +101,44 @@ class ContactsStore:
             lines.append(": ".join(parts))
         return ", ".join(lines)
 
+    async def close(self):
+        """Close the store's Notion client (called on application shutdown)."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
     # -- Internal methods --
 
-    def _ensure_cache(self):
+    def _get_http(self) -> httpx.AsyncClient:
+        """Return the store's Notion client, reusing its connection between calls."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=NOTION_API_BASE,
+                headers={
+                    'Authorization': f'Bearer {config.NOTION_TOKEN}',
+                    'Notion-Version': '2022-06-28',
+                },
+                timeout=10.0,
+            )
+        return self._http
+
+    async def _ensure_cache(self):
         now = time.time()
         if config.NOTION_CONTACTS_DB_ID:
             if now - self._cache_timestamp > CACHE_TTL_SECONDS:
-                self._refresh_from_notion()
+                await self._refresh_from_notion()
                 if not self._seed_loaded:
-                    self._load_seed_contacts()
+                    await self._load_seed_contacts()
                     self._seed_loaded = True
                 self._cache_timestamp = now
+                self._prompt = None
         else:
             if not self._seed_loaded:
-                self._load_seed_contacts()
+                await self._load_seed_contacts()
                 self._seed_loaded = True
+                self._prompt = None
 
-    def _load_seed_contacts(self):
+    async def _load_seed_contacts(self):
         """Merge config.CONTACTS (from env var) into cache."""
         seed = getattr(config, 'CONTACTS', {})
         for name_lower, value in seed.items():
@@ -108,9 +147,9 @@ class ContactsStore:
 
             email = ""
             phone = ""
-            if "@" in value:
+            if _EMAIL_RE.match(value):
                 email = value
-            elif value.startswith("+") or value.replace("-", "").replace(" ", "").isdigit():
+            elif _PHONE_RE.match(value):
                 phone = value
             else:
                 email = value
@@ -120,59 +159,94 @@ class ContactsStore:
 
             if config.NOTION_CONTACTS_DB_ID:
                 try:
-                    page = self._create_notion_page(contact["name"], email, phone, "manual")
+                    page = await self._create_notion_page(contact["name"], email, phone, "manual")
                     self._cache[name_lower]["page_id"] = page["id"]
                 except Exception:
                     pass
 
-    def _refresh_from_notion(self):
-        """Query the Notion contacts database and repopulate cache."""
-        try:
-            headers = {
-                'Authorization': f'Bearer {config.NOTION_TOKEN}',
-                'Notion-Version': '2022-06-28',
-                'Content-Type': 'application/json'
-            }
-            resp = httpx.post(
-                f'https://api.notion.com/v1/databases/{config.NOTION_CONTACTS_DB_ID}/query',
-                headers=headers,
-                json={}
-            )
-            if resp.status_code != 200:
-                logger.warning(f"Contacts DB query failed: {resp.status_code}")
-                return
+    async def _refresh_from_notion(self):
+        """
+        Refresh the cache from the Notion contacts database.
 
-            new_cache = {}
-            for page in resp.json().get("results", []):
-                if page.get("archived", False):
-                    continue
-                props = page.get("properties", {})
-
-                name_data = props.get("Name", {}).get("title", [])
-                name = name_data[0]["text"]["content"] if name_data else None
-                if not name:
-                    continue
-
-                email = props.get("Email", {}).get("email", "") or ""
-                phone = props.get("Phone", {}).get("phone_number", "") or ""
-                source_data = props.get("Source", {}).get("select")
-                source = source_data.get("name") if source_data else "manual"
-
-                new_cache[name.strip().lower()] = {
-                    "name": name.strip(),
-                    "email": email,
-                    "phone": phone,
-                    "source": source,
-                    "page_id": page["id"]
-                }
-
-            self._cache = new_cache
+        Between hourly full reloads only pages edited since the last refresh
+        are fetched and merged in. Notion rounds last_edited_time to the
+        minute, so the window starts a minute early.
+        """
+        try:
+            started = datetime.now(timezone.utc) - timedelta(minutes=1)
+            full = (self._edited_since is None
+                    or time.time() - self._last_full_refresh > FULL_REFRESH_SECONDS)
+            query = {} if full else {"filter": {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": self._edited_since},
+            }}
+
+            if full:
+                new_cache = {}
+                async for page in self._query_pages(query):
+                    contact = self._contact_from_page(page)
+                    if contact:
+                        new_cache[contact["name"].lower()] = contact
+                self._cache = new_cache
+                self._last_full_refresh = time.time()
+            else:
+                async for page in self._query_pages(query):
+                    # Drop the old entry first in case the contact was renamed
+                    for key in [k for k, c in self._cache.items() if c.get("page_id") == page["id"]]:
+                        del self._cache[key]
+                    contact = self._contact_from_page(page)
+                    if contact:
+                        self._cache[contact["name"].lower()] = contact
+
+            self._edited_since = started.isoformat()
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"Contacts DB query failed: {e.response.status_code}")
         except Exception as e:
             logger.warning(f"Failed to refresh contacts from Notion: {type(e).__name__}")
 
-    def _create_notion_page(self, name, email, phone, source):
-        from notion_client import Client
-        client = Client(auth=config.NOTION_TOKEN)
+    async def _query_pages(self, query: dict):
+        """Yield every page matching a contacts database query, 100 per request."""
+        body = {**query, "page_size": 100}
+        while True:
+            resp = await self._get_http().post(
+                f'/databases/{config.NOTION_CONTACTS_DB_ID}/query',
+                json=body
+            )
+            resp.raise_for_status()
+
+            data = resp.json()
+            for page in data.get("results", []):
+                yield page
+            if not data.get("has_more") or not data.get("next_cursor"):
+                return
+            body["start_cursor"] = data["next_cursor"]
+
+    @staticmethod
+    def _contact_from_page(page: dict) -> Optional[dict]:
+        """Convert a Notion contacts page to a cache entry (None if archived or unnamed)."""
+        if page.get("archived", False):
+            return None
+        props = page.get("properties", {})
+
+        name_data = props.get("Name", {}).get("title", [])
+        name = name_data[0]["text"]["content"] if name_data else None
+        if not name or not name.strip():
+            return None
+
+        email = props.get("Email", {}).get("email", "") or ""
+        phone = props.get("Phone", {}).get("phone_number", "") or ""
+        source_data = props.get("Source", {}).get("select")
+        source = source_data.get("name") if source_data else "manual"
+
+        return {
+            "name": name.strip(),
+            "email": email,
+            "phone": phone,
+            "source": source,
+            "page_id": page["id"]
+        }
+
+    async def _create_notion_page(self, name, email, phone, source):
         properties = {
             "Name": {"title": [{"text": {"content": name}}]}
         }
@@ -183,21 +257,22 @@ class ContactsStore:
         if source:
             properties["Source"] = {"select": {"name": source}}
 
-        return client.pages.create(
-            parent={"database_id": config.NOTION_CONTACTS_DB_ID},
-            properties=properties
-        )
+        resp = await self._get_http().post('/pages', json={
+            "parent": {"database_id": config.NOTION_CONTACTS_DB_ID},
+            "properties": properties
+        })
+        resp.raise_for_status()
+        return resp.json()
 
-    def _update_notion_page(self, page_id, email=None, phone=None):
-        from notion_client import Client
-        client = Client(auth=config.NOTION_TOKEN)
+    async def _update_notion_page(self, page_id, email=None, phone=None):
         properties = {}
         if email is not None:
             properties["Email"] = {"email": email}
         if phone is not None:
             properties["Phone"] = {"phone_number": phone}
         if properties:
-            client.pages.update(page_id=page_id, properties=properties)
+            resp = await self._get_http().patch(f'/pages/{page_id}', json={"properties": properties})
+            resp.raise_for_status()
 
 
 contacts_store = ContactsStore()
@@ -1,20 +1,41 @@
 """Email inbox service - read incoming emails via Agentmail."""
 from __future__ import annotations
+import html
+import itertools
 import logging
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Optional
 import config
 
 logger = logging.getLogger(__name__)
 
+RECENT_TTL_SECONDS = 8  # reuse a listing for calls this close together
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+SEEN_IDS_MAX = 10_000  # oldest seen message IDs are forgotten past this
+PREFETCH_TOP = 5  # bodies fetched ahead of time for the newest messages
+_HAS_INBOX = bool(getattr(config, 'AGENTMAIL_API_KEY', '') and
+                  getattr(config, 'AGENTMAIL_INBOX', ''))
+
+# Small pool so prefetching stays well inside Agentmail's rate limits
+_prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="inbox-prefetch")
+
 
 class EmailInboxService:
     """Read and manage incoming emails from Agentmail inbox."""
 
     def __init__(self):
         self._client = None
-        self._seen_ids: set[str] = set()
+        self._inbox = ''
+        self._seen_ids: OrderedDict[str, None] = OrderedDict()
         self._messages_cache: list[dict] = []
+        self._recent: list[dict] = []  # last listing fetched from Agentmail
+        self._recent_fetched_at: float = 0.0
+        self._recent_limit: int = 0
+        self._body_futures: dict[str, Future] = {}
 
     def _ensure_client(self):
         """Lazy-init the Agentmail client."""
@@ -24,17 +45,35 @@ class EmailInboxService:
                 raise ValueError("Agentmail not configured")
             from agentmail import AgentMail
             self._client = AgentMail(api_key=api_key)
+            self._inbox = getattr(config, 'AGENTMAIL_INBOX', '')
 
     def is_configured(self) -> bool:
         """Check if inbox reading is available."""
-        return bool(getattr(config, 'AGENTMAIL_API_KEY', '') and
-                     getattr(config, 'AGENTMAIL_INBOX', ''))
+        return _HAS_INBOX
+
+    def invalidate(self):
+        """Force the next get_recent to hit Agentmail."""
+        self._recent_fetched_at = 0.0
+
+    def get_recent(self, limit: int = 10, prefetch: bool = False) -> list[dict]:
+        """Get recent inbox messages. Returns list of message summaries.
+
+        With prefetch=True (interactive listings only, not notification polls),
+        the newest bodies are fetched in the background so a following read
+        by number doesn't wait on a second round-trip.
+        """
+        # A listing fetched with at least this limit a few seconds ago is
+        # still good; notification polls and user commands often coincide
+        if (limit <= self._recent_limit
+                and time.monotonic() - self._recent_fetched_at < RECENT_TTL_SECONDS):
+            self._messages_cache = self._recent[:limit]
+            if prefetch:
+                self._prefetch_bodies(self._inbox, self._messages_cache[:PREFETCH_TOP])
+            return list(self._messages_cache)
 
-    def get_recent(self, limit: int = 10) -> list[dict]:
-        """Get recent inbox messages. Returns list of message summaries."""
         try:
             self._ensure_client()
-            inbox = getattr(config, 'AGENTMAIL_INBOX', '')
+            inbox = self._inbox
             if not inbox:
                 logger.warning("AGENTMAIL_INBOX not set")
                 return []
@@ -62,7 +101,8 @@ class EmailInboxService:
                     return []
 
             messages = []
-            for msg in raw_messages:
+            # The SDK may hand back more than asked for; don't build the extras
+            for msg in itertools.islice(raw_messages, limit):
                 msg_id = getattr(msg, 'message_id', None) or getattr(msg, 'id', None) or ''
                 sender = getattr(msg, 'from_', None) or getattr(msg, 'sender', None) or ''
                 subject = getattr(msg, 'subject', None) or '(no subject)'
@@ -80,24 +120,51 @@ class EmailInboxService:
 
             logger.info(f"Fetched {len(messages)} inbox messages")
             self._messages_cache = messages
-            return messages
+            self._recent = messages
+            self._recent_fetched_at = time.monotonic()
+            self._recent_limit = limit
+            if prefetch:
+                self._prefetch_bodies(inbox, messages[:PREFETCH_TOP])
+            return list(messages)
 
         except Exception as e:
             logger.error(f"Failed to fetch inbox: {type(e).__name__}: {e}")
             return []
 
+    def _prefetch_bodies(self, inbox: str, messages: list[dict]):
+        """Start fetching full messages in the background so reads are local."""
+        futures = {}
+        for m in messages:
+            # Keep earlier fetches still in the top; only new messages are fetched
+            fut = self._body_futures.get(m["id"])
+            if fut is None:
+                fut = _prefetch_pool.submit(
+                    self._client.inboxes.messages.get, inbox_id=inbox, message_id=m["id"]
+                )
+            futures[m["id"]] = fut
+        self._body_futures = futures
+
     def get_message(self, message_id: str) -> Optional[dict]:
         """Get full message content by ID."""
         try:
             self._ensure_client()
-            inbox = getattr(config, 'AGENTMAIL_INBOX', '')
+            inbox = self._inbox
             if not inbox:
                 return None
 
-            msg = self._client.inboxes.messages.get(
-                inbox_id=inbox,
-                message_id=message_id
-            )
+            msg = None
+            prefetched = self._body_futures.get(message_id)
+            if prefetched is not None:
+                # Callers run off the event loop, so waiting here is fine
+                try:
+                    msg = prefetched.result(timeout=5)
+                except Exception:
+                    msg = None  # fetch it directly below
+            if msg is None:
+                msg = self._client.inboxes.messages.get(
+                    inbox_id=inbox,
+                    message_id=message_id
+                )
 
             body = ''
             if hasattr(msg, 'text') and msg.text:
@@ -106,9 +173,7 @@ class EmailInboxService:
                 body = msg.extracted_text
             elif hasattr(msg, 'html') and msg.html:
                 # Basic HTML stripping fallback
-                import re
-                body = re.sub(r'<[^>]+>', '', msg.html)
-                body = body.strip()
+                body = html.unescape(_HTML_TAG_RE.sub('', msg.html)).strip()
 
             return {
                 "id": msg.message_id,
@@ -131,7 +196,9 @@ class EmailInboxService:
     def get_message_by_num(self, num: int) -> Optional[dict]:
         """Get full message content by its position in the cached list (1-indexed)."""
         if not self._messages_cache:
-            self.get_recent()
+            # Cold cache: the listing has no bodies, so start the newest
+            # fetches together with it rather than one more round-trip after
+            self.get_recent(prefetch=True)
         if num < 1 or num > len(self._messages_cache):
             return None
         msg_summary = self._messages_cache[num - 1]
@@ -140,27 +207,30 @@ class EmailInboxService:
     def get_new_messages(self) -> list[dict]:
         """Get messages not yet seen (for notifications). Marks them as seen."""
         messages = self.get_recent()
-        new = []
-        for msg in messages:
-            if msg["id"] not in self._seen_ids:
-                new.append(msg)
-                self._seen_ids.add(msg["id"])
+        new_ids = {m["id"] for m in messages} - self._seen_ids.keys()
+        new = [m for m in messages if m["id"] in new_ids]
+        self._mark_seen(new)
         if new:
             logger.info(f"Found {len(new)} new email(s)")
         return new
 
     def seed_seen_ids(self):
         """On first run, mark all current messages as seen so we don't spam."""
-        messages = self.get_recent()
-        for msg in messages:
-            self._seen_ids.add(msg["id"])
+        self._mark_seen(self.get_recent())
         logger.info(f"Seeded {len(self._seen_ids)} existing email IDs")
 
+    def _mark_seen(self, messages: list[dict]):
+        for msg in messages:
+            self._seen_ids[msg["id"]] = None
+            self._seen_ids.move_to_end(msg["id"])
+        while len(self._seen_ids) > SEEN_IDS_MAX:
+            self._seen_ids.popitem(last=False)
+
     def reply_to(self, message_id: str, text: str) -> tuple[bool, str]:
         """Reply to a message. Returns (success, message)."""
         try:
             self._ensure_client()
-            inbox = getattr(config, 'AGENTMAIL_INBOX', '')
+            inbox = self._inbox
             if not inbox:
                 return False, "Inbox not configured"
 
@@ -169,6 +239,8 @@ class EmailInboxService:
                 message_id=message_id,
                 text=text
             )
+            # The reply shows up in the inbox listing
+            self.invalidate()
             return True, "Reply sent"
 
         except Exception as e:
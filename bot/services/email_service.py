@@ -1,12 +1,165 @@
 """Email service for sending emails via Agentmail or SMTP."""
+import atexit
+import queue
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import threading
+from contextlib import contextmanager
+from email.message import EmailMessage
 import config
 
+# Recycle a connection after this many messages; most providers cap it
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+SMTP_POOL_SIZE = 5
+# A bulk send of at least this many messages stops once a third have failed
+BULK_ABORT_MIN_MESSAGES = 30
+
+# config is read from the environment once at import, so these never change
+_HAS_AGENTMAIL = bool(getattr(config, 'AGENTMAIL_API_KEY', ''))
+_HAS_SMTP = bool(getattr(config, 'SMTP_EMAIL', '') and getattr(config, 'SMTP_PASSWORD', ''))
+
+
+# Errors where the server refused one message but the session is still usable
+_MESSAGE_REJECTED = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+class _PooledConnection:
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.sent = 0
+
+
+class SMTPPool:
+    """Bounded pool of logged-in SMTP connections to one server and account."""
+
+    def __init__(self, host: str, port: int, user: str, password: str,
+                 max_size: int = SMTP_POOL_SIZE, max_messages: int = SMTP_MAX_MESSAGES_PER_CONNECTION):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.max_messages = max_messages
+        self._idle: queue.Queue = queue.Queue(max_size)
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def send(self, msg: EmailMessage):
+        """Send msg on a pooled connection, retrying once if the server hung up."""
+        try:
+            with self.acquire() as conn:
+                conn.server.send_message(msg)
+                conn.sent += 1
+        except smtplib.SMTPServerDisconnected:
+            with self.acquire() as conn:
+                conn.server.send_message(msg)
+                conn.sent += 1
+
+    @contextmanager
+    def acquire(self):
+        """
+        Check out a connection for the duration of the with-block.
+
+        Blocks while max_size connections are in use. A connection under its
+        message limit goes back to the pool when the block exits cleanly, or
+        after an RSET when the server only rejected the message; on any other
+        error it is closed.
+        """
+        self._slots.acquire()
+        try:
+            conn = self._checkout()
+            try:
+                yield conn
+            except _MESSAGE_REJECTED:
+                self._release(conn, reset=True)
+                raise
+            except BaseException:
+                _close(conn.server)
+                raise
+            self._release(conn)
+        finally:
+            self._slots.release()
+
+    def _release(self, conn: _PooledConnection, reset: bool = False):
+        if reset:
+            try:
+                conn.server.rset()
+            except (smtplib.SMTPException, OSError):
+                _close(conn.server)
+                return
+        if conn.sent >= self.max_messages:
+            _close(conn.server)
+        else:
+            self._idle.put_nowait(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _close(conn.server)
+
+    def _checkout(self) -> _PooledConnection:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return _PooledConnection(self._connect())
+            if _alive(conn.server):
+                return conn
+            _close(conn.server)
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port)
+        try:
+            server.starttls()
+            server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+
+def _alive(server: smtplib.SMTP) -> bool:
+    try:
+        return server.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def _close(server: smtplib.SMTP):
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+_pools: dict[tuple, SMTPPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(host: str, port: int, user: str, password: str) -> SMTPPool:
+    """Return the pool for (host, port, user), replacing it if the password changed."""
+    with _pools_lock:
+        pool = _pools.get((host, port, user))
+        if pool is None or pool.password != password:
+            if pool is not None:
+                pool.close_all()
+            pool = _pools[(host, port, user)] = SMTPPool(host, port, user, password)
+        return pool
+
+
+@atexit.register
+def _close_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
+
+
+_agentmail_client = None
+
 
 def send_via_agentmail(to_email: str, subject: str, body: str) -> tuple[bool, str]:
     """Send email via Agentmail API."""
+    global _agentmail_client
     try:
         from agentmail import AgentMail
 
@@ -16,9 +169,11 @@ def send_via_agentmail(to_email: str, subject: str, body: str) -> tuple[bool, st
         if not api_key or not inbox_email:
             return False, "Agentmail not configured"
 
-        client = AgentMail(api_key=api_key)
+        # One client for the process, so the SDK can keep its connection alive
+        if _agentmail_client is None:
+            _agentmail_client = AgentMail(api_key=api_key)
 
-        client.inboxes.messages.send(
+        _agentmail_client.inboxes.messages.send(
             inbox_id=inbox_email,
             to=to_email,
             subject=subject,
@@ -33,27 +188,34 @@ def send_via_agentmail(to_email: str, subject: str, body: str) -> tuple[bool, st
         return False, f"Agentmail error: {type(e).__name__}"
 
 
+def _smtp_settings() -> tuple[str, int, str, str]:
+    return (
+        getattr(config, 'SMTP_HOST', 'smtp.gmail.com'),
+        getattr(config, 'SMTP_PORT', 587),
+        getattr(config, 'SMTP_EMAIL', ''),
+        getattr(config, 'SMTP_PASSWORD', ''),
+    )
+
+
+def _build_message(from_email: str, to_email: str, subject: str, body: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg['From'] = from_email
+    msg['To'] = to_email
+    msg['Subject'] = subject
+    msg.set_content(body)
+    return msg
+
+
 def send_via_smtp(to_email: str, subject: str, body: str) -> tuple[bool, str]:
     """Send email via SMTP."""
-    smtp_email = getattr(config, 'SMTP_EMAIL', '')
-    smtp_password = getattr(config, 'SMTP_PASSWORD', '')
-    smtp_host = getattr(config, 'SMTP_HOST', 'smtp.gmail.com')
-    smtp_port = getattr(config, 'SMTP_PORT', 587)
+    smtp_host, smtp_port, smtp_email, smtp_password = _smtp_settings()
 
     if not smtp_email or not smtp_password:
         return False, "SMTP not configured"
 
     try:
-        msg = MIMEMultipart()
-        msg['From'] = smtp_email
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        msg.attach(MIMEText(body, 'plain'))
-
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_email, smtp_password)
-            server.send_message(msg)
+        msg = _build_message(smtp_email, to_email, subject, body)
+        _get_pool(smtp_host, smtp_port, smtp_email, smtp_password).send(msg)
 
         return True, f"Email sent to {to_email}"
 
@@ -73,18 +235,79 @@ def send_email(to_email: str, subject: str, body: str) -> tuple[bool, str]:
         (success: bool, message: str)
     """
     # Try Agentmail first if configured
-    if getattr(config, 'AGENTMAIL_API_KEY', ''):
+    if _HAS_AGENTMAIL:
         return send_via_agentmail(to_email, subject, body)
 
     # Fall back to SMTP
-    if getattr(config, 'SMTP_EMAIL', '') and getattr(config, 'SMTP_PASSWORD', ''):
+    if _HAS_SMTP:
         return send_via_smtp(to_email, subject, body)
 
     return False, "Email not configured. Set AGENTMAIL_API_KEY or SMTP credentials."
 
 
+def send_bulk_via_smtp(messages: list[dict]) -> list[tuple[bool, str]]:
+    """
+    Send several emails over as few SMTP sessions as possible.
+
+    Each message is a dict with to, subject and body. A refused message is
+    followed by RSET and the session carries on. Returns one (success,
+    message) tuple per input, in order.
+    """
+    smtp_host, smtp_port, smtp_email, smtp_password = _smtp_settings()
+    if not smtp_email or not smtp_password:
+        return [(False, "SMTP not configured")] * len(messages)
+
+    pool = _get_pool(smtp_host, smtp_port, smtp_email, smtp_password)
+    results: list[tuple[bool, str]] = []
+    failures = 0
+
+    try:
+        while len(results) < len(messages):
+            # A connection is retired at its message limit, so a long batch
+            # may span several sessions.
+            with pool.acquire() as conn:
+                while len(results) < len(messages) and conn.sent < pool.max_messages:
+                    if len(messages) >= BULK_ABORT_MIN_MESSAGES and failures * 3 >= len(messages):
+                        skipped = len(messages) - len(results)
+                        return results + [(False, "Skipped: too many failures in batch")] * skipped
+
+                    m = messages[len(results)]
+                    try:
+                        conn.server.send_message(_build_message(smtp_email, m["to"], m["subject"], m["body"]))
+                        results.append((True, f"Email sent to {m['to']}"))
+                    except smtplib.SMTPRecipientsRefused:
+                        results.append((False, f"Invalid recipient: {m['to']}"))
+                        failures += 1
+                        conn.server.rset()
+                    except (smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                        results.append((False, f"SMTP error: {type(e).__name__}"))
+                        failures += 1
+                        conn.server.rset()
+                    conn.sent += 1
+    except smtplib.SMTPAuthenticationError:
+        reason = "SMTP auth failed"
+    except Exception as e:
+        reason = f"SMTP error: {type(e).__name__}"
+    else:
+        return results
+    return results + [(False, reason)] * (len(messages) - len(results))
+
+
+def send_bulk(messages: list[dict]) -> list[tuple[bool, str]]:
+    """
+    Send several emails (dicts with to, subject, body) - Agentmail or SMTP.
+
+    Returns one (success, message) tuple per input, in order.
+    """
+    if _HAS_AGENTMAIL:
+        return [send_via_agentmail(m["to"], m["subject"], m["body"]) for m in messages]
+
+    if _HAS_SMTP:
+        return send_bulk_via_smtp(messages)
+
+    return [(False, "Email not configured. Set AGENTMAIL_API_KEY or SMTP credentials.")] * len(messages)
+
+
 def is_email_configured() -> bool:
     """Check if email is configured."""
-    has_agentmail = bool(getattr(config, 'AGENTMAIL_API_KEY', ''))
-    has_smtp = bool(getattr(config, 'SMTP_EMAIL', '') and getattr(config, 'SMTP_PASSWORD', ''))
-    return has_agentmail or has_smtp
+    return _HAS_AGENTMAIL or _HAS_SMTP
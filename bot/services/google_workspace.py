@@ -4,7 +4,7 @@ Uses httpx (no google-api-python-client). Auth via google_auth.py.
 """
 import base64
 import logging
-from email.mime.text import MIMEText
+from email.message import EmailMessage
 
 from bot.services.google_auth import get_access_token, _http
 
@@ -77,9 +77,10 @@ def send_email(user_id: int, to: str, subject: str, body: str) -> bool:
     if not token:
         return False
 
-    msg = MIMEText(body, "plain")
+    msg = EmailMessage()
     msg["to"] = to
     msg["subject"] = subject
+    msg.set_content(body)
     raw = base64.urlsafe_b64encode(msg.as_bytes()).decode()
 
     try:
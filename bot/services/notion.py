@@ -1,35 +1,122 @@
 """Notion API service for task management."""
+import atexit
 import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, date
 from typing import Optional
 from notion_client import Client
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
 import httpx
 import config
 
 logger = logging.getLogger(__name__)
 
+# Failures from the Notion SDK or the raw HTTP calls that callers should
+# surface to the user rather than treat as bugs
+_NOTION_ERRORS = (HTTPResponseError, RequestTimeoutError, httpx.HTTPError)
+
+NOTION_API_BASE = "https://api.notion.com/v1"
+
+# How long a fetched database schema is trusted before it is fetched again
+SCHEMA_TTL_SECONDS = 600
+
+# Properties the service reads and writes, resolved once per schema fetch
+_KNOWN_PROPERTIES = ("Task", "Name", "Category", "Priority", "Status", "Done", "Due Date", "Due", "Reminder")
+
+# Runs the schema fetch in parallel with a task query (see get_tasks)
+_background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notion-schema")
+
+# Page updates for batch operations; Notion averages ~3 requests per second
+_writers = ThreadPoolExecutor(max_workers=3, thread_name_prefix="notion-write")
+
+
+# Markers older versions of the bot wrote into task titles instead of properties
+_LEGACY_EMOJI_RE = re.compile("[🔴⚪💼🏠]")
+_LEGACY_EMOJI_DELETE = str.maketrans("", "", "🔴⚪💼🏠")
+
+
+def _parse_legacy_title(title: str) -> tuple:
+    """
+    Pull legacy emoji/[B]/[P] markers out of a task title.
+
+    Returns (cleaned_title, priority, category, due); the last three are
+    None when the title has no marker for them.
+    """
+    priority = category = due = None
+    found = set(_LEGACY_EMOJI_RE.findall(title))
+    if found:
+        drop = ""
+        if "🔴" in found:
+            priority, drop = "High", drop + "🔴"
+        elif "⚪" in found:
+            priority, drop = "Low", drop + "⚪"
+        if "💼" in found:
+            category, drop = "Business", drop + "💼"
+        elif "🏠" in found:
+            category, drop = "Personal", drop + "🏠"
+        title = title.translate(str.maketrans("", "", drop))
+
+    if "📅" in title:
+        parts = title.split("📅", 2)
+        title = parts[0]
+        due = parts[1].strip()
+
+    # Support old [B]/[P] format
+    if "[B] " in title:
+        category = category or "Business"
+        title = title.replace("[B] ", "")
+    elif "[P] " in title:
+        title = title.replace("[P] ", "")
+
+    return title, priority, category, due
+
+
+@lru_cache(maxsize=512)
+def _due_display(iso_date: str) -> str:
+    """Format a YYYY-MM-DD date as 'Mar 05'; raises ValueError for anything else."""
+    return date.fromisoformat(iso_date).strftime("%b %d")
+
+
+class TaskBotError(Exception):
+    """A Notion task operation failed (API error, timeout or network)."""
+
 
 class NotionTaskService:
     """Service for managing tasks in Notion."""
 
     def __init__(self):
         self.client = Client(auth=config.NOTION_TOKEN)
+        # Keep-alive client for the raw REST calls the SDK doesn't cover; kept
+        # separate from the SDK's own client, which sends its own Notion-Version
+        self._http = httpx.Client(
+            base_url=NOTION_API_BASE,
+            headers={
+                'Authorization': f'Bearer {config.NOTION_TOKEN}',
+                'Notion-Version': '2022-06-28',
+            },
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+        atexit.register(self._http.close)
         self.database_id = config.NOTION_DATABASE_ID
         self._db_schema = None
+        self._db_schema_fetched_at = 0.0
+        self._property_names: dict[str, str] = {}  # lowercased name -> actual name
+        self._prop_names: dict[str, Optional[str]] = {}  # _KNOWN_PROPERTIES -> actual name
+
+    def _schema_is_stale(self) -> bool:
+        return self._db_schema is None or time.monotonic() - self._db_schema_fetched_at > SCHEMA_TTL_SECONDS
 
     def _get_db_schema(self) -> dict:
-        """Get and cache the database schema to check available properties."""
-        if self._db_schema is None:
+        """Get and cache the database schema (for SCHEMA_TTL_SECONDS) to check available properties."""
+        if self._schema_is_stale():
+            self._db_schema_fetched_at = time.monotonic()
             try:
                 # Use raw API call as notion-client may not return properties
-                headers = {
-                    'Authorization': f'Bearer {config.NOTION_TOKEN}',
-                    'Notion-Version': '2022-06-28'
-                }
-                resp = httpx.get(
-                    f'https://api.notion.com/v1/databases/{self.database_id}',
-                    headers=headers
-                )
+                resp = self._http.get(f'/databases/{self.database_id}')
                 if resp.status_code == 200:
                     self._db_schema = resp.json().get("properties", {})
                 else:
@@ -37,17 +124,28 @@ class NotionTaskService:
             except Exception as e:
                 logger.error(f"Failed to fetch DB schema: {type(e).__name__}: {e}")
                 self._db_schema = {}
+
+            # First property wins if two differ only by case, as in a linear scan
+            self._property_names = {}
+            for key in self._db_schema:
+                self._property_names.setdefault(key.lower(), key)
+            self._prop_names = {name: self._resolve_property(name) for name in _KNOWN_PROPERTIES}
         return self._db_schema
 
-    def _get_property_name(self, prop_name: str) -> Optional[str]:
-        """Get the actual property name from the database schema."""
-        schema = self._get_db_schema()
-        variations = [prop_name, prop_name.replace(" ", ""), prop_name.lower()]
-        for var in variations:
-            for key in schema:
-                if key.lower() == var.lower():
-                    return key
-        return None
+    def _invalidate_schema_on(self, error: Exception):
+        """Drop the cached schema if Notion rejected a request as malformed or missing."""
+        if getattr(error, "status", None) in (400, 404):
+            self._db_schema = None
+
+    def _resolve_property(self, prop_name: str) -> Optional[str]:
+        """Get the actual property name from the loaded database schema."""
+        names = self._property_names
+        return names.get(prop_name.lower()) or names.get(prop_name.replace(" ", "").lower())
+
+    def _props(self) -> dict[str, Optional[str]]:
+        """Actual names of _KNOWN_PROPERTIES (None if missing), from a fresh schema."""
+        self._get_db_schema()
+        return self._prop_names
 
     def add_task(
         self,
@@ -58,52 +156,64 @@ class NotionTaskService:
         reminder_time: Optional[datetime] = None
     ) -> dict:
         """Add a new task to Notion using database properties."""
+        names = self._props()
         # Determine the title property name
-        title_prop = self._get_property_name("Task") or self._get_property_name("Name") or "Name"
+        title_prop = names["Task"] or names["Name"] or "Name"
 
         properties = {
             title_prop: {"title": [{"text": {"content": title}}]}
         }
 
         # Add Category if property exists
-        category_prop = self._get_property_name("Category")
+        category_prop = names["Category"]
         if category_prop:
             properties[category_prop] = {"select": {"name": category}}
 
         # Add Priority if property exists
-        priority_prop = self._get_property_name("Priority")
+        priority_prop = names["Priority"]
         if priority_prop:
             properties[priority_prop] = {"select": {"name": priority}}
 
         # Add Status if property exists
-        status_prop = self._get_property_name("Status")
+        status_prop = names["Status"]
         if status_prop:
             properties[status_prop] = {"select": {"name": "To Do"}}
 
         # Set Done checkbox to false for new tasks
-        done_prop = self._get_property_name("Done")
+        done_prop = names["Done"]
         if done_prop:
             properties[done_prop] = {"checkbox": False}
 
         # Add Due Date if property exists and date provided
-        due_prop = self._get_property_name("Due Date") or self._get_property_name("Due")
+        due_prop = names["Due Date"] or names["Due"]
         if due_prop and due_date:
             properties[due_prop] = {"date": {"start": due_date.isoformat()}}
 
         # Add Reminder if property exists and reminder time provided
-        reminder_prop = self._get_property_name("Reminder")
+        reminder_prop = names["Reminder"]
         if reminder_prop and reminder_time:
             properties[reminder_prop] = {"date": {"start": reminder_time.isoformat()}}
 
-        response = self.client.pages.create(
-            parent={"database_id": self.database_id},
-            properties=properties
-        )
-        return response
+        try:
+            return self.client.pages.create(
+                parent={"database_id": self.database_id},
+                properties=properties
+            )
+        except _NOTION_ERRORS as e:
+            self._invalidate_schema_on(e)
+            raise TaskBotError(f"Failed to create task: {e}") from e
+
+    def _update_page(self, **kwargs) -> dict:
+        """pages.update wrapper that turns Notion failures into TaskBotError."""
+        try:
+            return self.client.pages.update(**kwargs)
+        except _NOTION_ERRORS as e:
+            self._invalidate_schema_on(e)
+            raise TaskBotError(f"Failed to update task: {e}") from e
 
     def _extract_property_value(self, props: dict, prop_name: str, prop_type: str):
-        """Extract value from a Notion property."""
-        actual_name = self._get_property_name(prop_name)
+        """Extract value from a Notion property; the schema must already be loaded."""
+        actual_name = self._prop_names.get(prop_name)
         if not actual_name or actual_name not in props:
             return None
 
@@ -129,29 +239,25 @@ class NotionTaskService:
         due_this_week: bool = False,
         overdue: bool = False
     ) -> list:
-        """Get tasks from Notion using database query."""
+        """Get tasks from Notion using database query; raises TaskBotError if that fails."""
         from datetime import timedelta
 
-        # Query the database directly via raw API
-        try:
-            headers = {
-                'Authorization': f'Bearer {config.NOTION_TOKEN}',
-                'Notion-Version': '2022-06-28',
-                'Content-Type': 'application/json'
-            }
-            resp = httpx.post(
-                f'https://api.notion.com/v1/databases/{self.database_id}/query',
-                headers=headers,
-                json={}
-            )
-            if resp.status_code == 200:
-                response = resp.json()
-            else:
-                # Safe print - avoid encoding errors
-                response = {"results": []}
-        except Exception as e:
-            logger.error(f"Failed to query Notion tasks: {type(e).__name__}: {e}")
-            response = {"results": []}
+        query = {}
+        schema_fetch = None
+        if self._schema_is_stale():
+            # The unfiltered query doesn't depend on the schema, so fetch it
+            # alongside instead of paying two round-trips back to back
+            schema_fetch = _background.submit(self._get_db_schema)
+        elif status != "Done" and self._db_schema.get("Done", {}).get("type") == "checkbox":
+            # Completed tasks are dropped below anyway; let Notion skip them.
+            # Category and due filters stay client-side because legacy tasks
+            # carry those in emoji markers in the title, not in properties.
+            query["filter"] = {"property": "Done", "checkbox": {"equals": False}}
+
+        results = self._query_database(query)
+
+        if schema_fetch is not None:
+            schema_fetch.result()
 
         tasks = []
         idx = 1
@@ -159,7 +265,7 @@ class NotionTaskService:
         today_str = today.strftime("%Y-%m-%d")
         week_end = (today + timedelta(days=7)).strftime("%Y-%m-%d")
 
-        for page in response.get("results", []):
+        for page in results:
             # Skip if archived
             if page.get("archived", False):
                 continue
@@ -192,32 +298,10 @@ class NotionTaskService:
 
             # Fallback: parse from emoji format for legacy tasks
             if not task_category or not task_priority:
-                if "🔴" in title:
-                    task_priority = task_priority or "High"
-                    title = title.replace("🔴", "")
-                elif "⚪" in title:
-                    task_priority = task_priority or "Low"
-                    title = title.replace("⚪", "")
-
-                if "💼" in title:
-                    task_category = task_category or "Business"
-                    title = title.replace("💼", "")
-                elif "🏠" in title:
-                    task_category = task_category or "Personal"
-                    title = title.replace("🏠", "")
-
-                if "📅" in title:
-                    parts = title.split("📅")
-                    title = parts[0]
-                    if not task_due and len(parts) > 1:
-                        task_due = parts[1].strip()
-
-                # Support old [B]/[P] format
-                if "[B] " in title:
-                    task_category = task_category or "Business"
-                    title = title.replace("[B] ", "")
-                elif "[P] " in title:
-                    title = title.replace("[P] ", "")
+                title, legacy_priority, legacy_category, legacy_due = _parse_legacy_title(title)
+                task_priority = task_priority or legacy_priority
+                task_category = task_category or legacy_category
+                task_due = task_due or legacy_due
 
             # Set defaults
             task_category = task_category or "Personal"
@@ -229,8 +313,8 @@ class NotionTaskService:
             task_due_date = None
             if task_due:
                 try:
-                    due_dt = datetime.fromisoformat(task_due.replace("Z", "+00:00"))
-                    due_display = due_dt.strftime("%b %d")
+                    # Only the date part matters; many tasks share a due date
+                    due_display = _due_display(task_due[:10])
                     task_due_date = task_due[:10]
 
                     # Check if due today
@@ -245,7 +329,7 @@ class NotionTaskService:
                     if overdue and task_due_date >= today_str:
                         continue
 
-                except (ValueError, AttributeError):
+                except (ValueError, TypeError):
                     due_display = task_due
 
             # For overdue filter, skip tasks without due date
@@ -275,9 +359,29 @@ class NotionTaskService:
 
         return tasks
 
+    def _query_database(self, query: dict) -> list:
+        """Run a raw database query, following cursors.
+
+        Raises TaskBotError if Notion can't be reached or rejects any page.
+        """
+        body = {**query, "page_size": 100}
+        results = []
+        try:
+            while True:
+                resp = self._http.post(f'/databases/{self.database_id}/query', json=body)
+                resp.raise_for_status()
+                data = resp.json()
+                results.extend(data.get("results", []))
+                if not data.get("has_more") or not data.get("next_cursor"):
+                    return results
+                body["start_cursor"] = data["next_cursor"]
+        except (*_NOTION_ERRORS, ValueError) as e:
+            logger.error(f"Failed to query Notion tasks: {type(e).__name__}: {e}")
+            raise TaskBotError(f"Failed to fetch tasks: {e}") from e
+
     def get_tasks_with_reminders(self) -> list:
         """Get tasks with reminders that are due now or in the past."""
-        reminder_prop = self._get_property_name("Reminder")
+        reminder_prop = self._props()["Reminder"]
         if not reminder_prop:
             return []
 
@@ -303,10 +407,7 @@ class NotionTaskService:
                         self._extract_property_value(props, "Name", "title") or "Untitled"
 
                 # Clean legacy emoji formatting
-                for emoji in ["🔴", "⚪", "💼", "🏠"]:
-                    title = title.replace(emoji, "")
-                if "📅" in title:
-                    title = title.split("📅")[0]
+                title = title.translate(_LEGACY_EMOJI_DELETE).partition("📅")[0]
 
                 tasks.append({
                     "id": page["id"],
@@ -321,8 +422,9 @@ class NotionTaskService:
 
     def mark_complete(self, page_id: str) -> dict:
         """Mark a task as complete using Done checkbox."""
-        done_prop = self._get_property_name("Done")
-        status_prop = self._get_property_name("Status")
+        names = self._props()
+        done_prop = names["Done"]
+        status_prop = names["Status"]
 
         properties = {}
 
@@ -336,43 +438,64 @@ class NotionTaskService:
 
         if properties:
             try:
-                return self.client.pages.update(
+                return self._update_page(
                     page_id=page_id,
                     properties=properties
                 )
-            except Exception as e:
-                logger.error(f"Failed to mark task complete: {type(e).__name__}: {e}")
+            except TaskBotError as e:
+                logger.error(f"Failed to mark task complete: {e}")
 
         # Fallback: archive
-        return self.client.pages.update(page_id=page_id, archived=True)
+        return self._update_page(page_id=page_id, archived=True)
+
+    def _update_many(self, update, page_ids: list[str], action: str) -> list[str]:
+        """Run update(page_id) concurrently for each page; return the IDs that failed."""
+        self._get_db_schema()  # resolve once, not in every worker
+        pending = [(page_id, _writers.submit(update, page_id)) for page_id in page_ids]
+        failed = []
+        for page_id, future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Failed to {action} {page_id}: {type(e).__name__}: {e}")
+                failed.append(page_id)
+        if failed:
+            logger.warning(f"{action}: {len(failed)} of {len(page_ids)} pages failed")
+        return failed
+
+    def mark_complete_many(self, page_ids: list[str]) -> list[str]:
+        """Mark several tasks complete with concurrent page updates; return the IDs that failed."""
+        return self._update_many(self.mark_complete, page_ids, "mark complete")
 
     def delete_task(self, page_id: str) -> dict:
         """Delete a task by archiving it in Notion."""
-        return self.client.pages.update(page_id=page_id, archived=True)
+        return self._update_page(page_id=page_id, archived=True)
 
     def restore_task(self, page_id: str) -> dict:
         """Restore an archived task by unarchiving it in Notion."""
         try:
-            result = self.client.pages.update(page_id=page_id, archived=False)
+            result = self._update_page(page_id=page_id, archived=False)
             # Also uncheck Done if it was marked complete
-            done_prop = self._get_property_name("Done")
-            status_prop = self._get_property_name("Status")
+            names = self._props()
+            done_prop = names["Done"]
+            status_prop = names["Status"]
             props = {}
             if done_prop:
                 props[done_prop] = {"checkbox": False}
             if status_prop:
                 props[status_prop] = {"select": {"name": "To Do"}}
             if props:
-                self.client.pages.update(page_id=page_id, properties=props)
+                self._update_page(page_id=page_id, properties=props)
             return result
-        except Exception as e:
-            logger.error(f"Failed to restore task: {type(e).__name__}: {e}")
+        except TaskBotError as e:
+            logger.error(f"Failed to restore task: {e}")
             raise
 
     def update_task_title(self, page_id: str, new_title: str) -> dict:
         """Update a task's title."""
-        title_prop = self._get_property_name("Task") or self._get_property_name("Name") or "Name"
-        return self.client.pages.update(
+        names = self._props()
+        title_prop = names["Task"] or names["Name"] or "Name"
+        return self._update_page(
             page_id=page_id,
             properties={
                 title_prop: {"title": [{"text": {"content": new_title}}]}
@@ -380,32 +503,28 @@ class NotionTaskService:
         )
 
     def clear_reminder(self, page_id: str) -> dict:
-        """Clear the reminder from a task."""
-        reminder_prop = self._get_property_name("Reminder")
+        """Clear the reminder from a task. Raises TaskBotError if Notion fails."""
+        reminder_prop = self._props()["Reminder"]
         if not reminder_prop:
             return {}
-        try:
-            return self.client.pages.update(
-                page_id=page_id,
-                properties={reminder_prop: {"date": None}}
-            )
-        except Exception as e:
-            logger.error(f"Failed to clear reminder: {type(e).__name__}: {e}")
-            return {}
+        return self._update_page(
+            page_id=page_id,
+            properties={reminder_prop: {"date": None}}
+        )
+
+    def clear_reminders(self, page_ids: list[str]) -> list[str]:
+        """Clear the reminders of several tasks with concurrent page updates; return the IDs that failed."""
+        return self._update_many(self.clear_reminder, page_ids, "clear reminder")
 
     def set_reminder(self, page_id: str, reminder_time: datetime) -> dict:
-        """Set a reminder time for a task."""
-        reminder_prop = self._get_property_name("Reminder")
+        """Set a reminder time for a task. Raises TaskBotError if Notion fails."""
+        reminder_prop = self._props()["Reminder"]
         if not reminder_prop:
             return {}
-        try:
-            return self.client.pages.update(
-                page_id=page_id,
-                properties={reminder_prop: {"date": {"start": reminder_time.isoformat()}}}
-            )
-        except Exception as e:
-            logger.error(f"Failed to set reminder: {type(e).__name__}: {e}")
-            return {}
+        return self._update_page(
+            page_id=page_id,
+            properties={reminder_prop: {"date": {"start": reminder_time.isoformat()}}}
+        )
 
 
 # Singleton instance
@@ -2,19 +2,26 @@
 import logging
 import os
 from datetime import datetime
+from functools import cache
 
 from bot.db.database import get_cursor
 
 logger = logging.getLogger(__name__)
 
 
-def _is_admin_id(telegram_user_id: int) -> bool:
-    """Check if this Telegram user ID is the configured admin."""
+@cache
+def _admin_ids() -> frozenset[str]:
+    """Configured admin IDs, parsed on first use (after .env is loaded)."""
     admin_ids = os.environ.get("ADMIN_USER_IDS", "")
     if not admin_ids:
         # Fall back to old ALLOWED_USER_IDS for backwards compat
         admin_ids = os.environ.get("ALLOWED_USER_IDS", "")
-    return str(telegram_user_id) in [x.strip() for x in admin_ids.split(",") if x.strip()]
+    return frozenset(x.strip() for x in admin_ids.split(",") if x.strip())
+
+
+def _is_admin_id(telegram_user_id: int) -> bool:
+    """Check if this Telegram user ID is the configured admin."""
+    return str(telegram_user_id) in _admin_ids()
 
 
 def get_or_create_user(telegram_user_id: int, username: str = None, first_name: str = None) -> dict:
@@ -1,6 +1,7 @@
 """WhatsApp OTP delivery via Twilio REST API (httpx, no SDK needed)."""
 import logging
 import os
+import re
 
 import httpx
 
@@ -12,6 +13,23 @@ _WHATSAPP_FROM = os.getenv("TWILIO_WHATSAPP_FROM", "")
 _CONTENT_SID = os.getenv("TWILIO_OTP_CONTENT_SID", "HX57226d9d902a1401df9a1715a7130fcb")
 _MESSAGING_SERVICE_SID = os.getenv("TWILIO_MESSAGING_SERVICE_SID", "MG43569efb51a03061fa0e328b171546bd")
 
+# E.164: + and country code, up to 15 digits in all
+_E164_RE = re.compile(r"\+[1-9]\d{7,14}")
+
+_http: httpx.AsyncClient | None = None
+
+
+def _get_http() -> httpx.AsyncClient:
+    """Lazy-init a keep-alive client for the Twilio API, reused across sends."""
+    global _http
+    if _http is None or _http.is_closed:
+        _http = httpx.AsyncClient(
+            base_url=f"https://api.twilio.com/2010-04-01/Accounts/{_ACCOUNT_SID}",
+            auth=(_ACCOUNT_SID, _AUTH_TOKEN),
+            timeout=15.0,
+        )
+    return _http
+
 
 def is_configured() -> bool:
     """Check if Twilio WhatsApp credentials are set."""
@@ -44,21 +62,22 @@ async def send_otp(phone: str, code: str) -> bool:
         logger.error(_last_error)
         return False
 
-    url = f"https://api.twilio.com/2010-04-01/Accounts/{_ACCOUNT_SID}/Messages.json"
+    # Twilio would reject it anyway, after a round-trip
+    if not _E164_RE.fullmatch(phone):
+        _last_error = "Invalid phone number — expected international format like +351912345678"
+        logger.warning(_last_error)
+        return False
 
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                url,
-                auth=(_ACCOUNT_SID, _AUTH_TOKEN),
-                data={
-                    "MessagingServiceSid": _MESSAGING_SERVICE_SID,
-                    "To": f"whatsapp:{phone}",
-                    "ContentSid": _CONTENT_SID,
-                    "ContentVariables": f'{{"1":"{code}"}}',
-                },
-                timeout=15.0,
-            )
+        resp = await _get_http().post(
+            "/Messages.json",
+            data={
+                "MessagingServiceSid": _MESSAGING_SERVICE_SID,
+                "To": f"whatsapp:{phone}",
+                "ContentSid": _CONTENT_SID,
+                "ContentVariables": f'{{"1":"{code}"}}',
+            },
+        )
 
         if resp.status_code in (200, 201):
             logger.info(f"WhatsApp OTP sent to ***{phone[-4:]}")
@@ -1,8 +1,14 @@
 """Configuration management for the Telegram Task Bot."""
 import os
-from dotenv import load_dotenv
+import re
 
-load_dotenv()
+# Deployed environments get their variables from the platform and have no
+# .env file, so don't import dotenv or look for one there
+if not (os.getenv("RAILWAY_ENVIRONMENT") or os.getenv("SKIP_DOTENV")):
+    from dotenv import load_dotenv
+    load_dotenv()
+
+_QUOTES = frozenset("\"'")
 
 
 def clean_env_value(value):
@@ -15,105 +21,144 @@ def clean_env_value(value):
         return ""
     # Strip whitespace first
     value = value.strip()
-    # Strip surrounding quotes (single or double)
+    # Strip surrounding quotes (single or double). A lone leading or trailing
+    # quote is dropped too (partial corruption), but when both ends are quotes
+    # that don't match, only the leading one goes.
     if len(value) >= 2:
-        if (value.startswith('"') and value.endswith('"')) or \
-           (value.startswith("'") and value.endswith("'")):
-            value = value[1:-1]
-        # Also handle case where only leading quote exists (partial corruption)
-        elif value.startswith('"') or value.startswith("'"):
-            value = value[1:]
-        elif value.endswith('"') or value.endswith("'"):
-            value = value[:-1]
+        first, last = value[0], value[-1]
+        lo = 1 if first in _QUOTES else 0
+        hi = -1 if last in _QUOTES and (not lo or last == first) else None
+        value = value[lo:hi]
     return value.strip()
 
 
-# Telegram Bot Token (get from @BotFather)
-# clean_env_value removes whitespace AND quotes that Railway might add
-TELEGRAM_BOT_TOKEN = clean_env_value(os.getenv("TELEGRAM_BOT_TOKEN"))
+# Settings are parsed from the environment on first access (see __getattr__
+# at the bottom), so importing this module doesn't parse every variable.
+
+
+def _str(var, default=""):
+    return lambda: clean_env_value(os.getenv(var)) or default
+
+
+def _int(var, default):
+    return lambda: int(os.getenv(var, default))
+
+
+def _allowed_user_ids():
+    # Only ever used for membership tests and iteration
+    return frozenset(int(id) for id in filter(None, map(str.strip, os.getenv("ALLOWED_USER_IDS", "").split(","))))
+
+
+# "name:value" entries of CONTACTS; the value may itself contain colons
+_CONTACT_RE = re.compile(r"([^:,]*):([^,]*)")
+
+
+def _contacts():
+    return {name.strip().lower(): value.strip()
+            for name, value in _CONTACT_RE.findall(_setting("CONTACTS_RAW"))}
+
+
+_SETTINGS = {
+    # Telegram Bot Token (get from @BotFather)
+    # clean_env_value removes whitespace AND quotes that Railway might add
+    "TELEGRAM_BOT_TOKEN": _str("TELEGRAM_BOT_TOKEN"),
+
+    # Notion Integration Token (get from notion.so/my-integrations)
+    "NOTION_TOKEN": _str("NOTION_TOKEN"),
+
+    # Notion Database ID (the ID from your tasks database URL)
+    "NOTION_DATABASE_ID": _str("NOTION_DATABASE_ID"),
+
+    # Notion Contacts Database ID (for persistent contact storage)
+    "NOTION_CONTACTS_DB_ID": _str("NOTION_CONTACTS_DB_ID"),
+
+    # Your Telegram user ID (for security - only you can use the bot)
+    # Get this by messaging @userinfobot on Telegram
+    "ALLOWED_USER_IDS": _allowed_user_ids,
+
+    # Reminder check interval in minutes
+    "REMINDER_CHECK_INTERVAL": _int("REMINDER_CHECK_INTERVAL", "5"),
+
+    # Email inbox check interval in minutes (for new email notifications)
+    "EMAIL_CHECK_INTERVAL": _int("EMAIL_CHECK_INTERVAL", "2"),
 
-# Notion Integration Token (get from notion.so/my-integrations)
-NOTION_TOKEN = clean_env_value(os.getenv("NOTION_TOKEN"))
+    # Anthropic API Key for Claude AI (optional - enables smart mode)
+    "ANTHROPIC_API_KEY": _str("ANTHROPIC_API_KEY"),
 
-# Notion Database ID (the ID from your tasks database URL)
-NOTION_DATABASE_ID = clean_env_value(os.getenv("NOTION_DATABASE_ID"))
+    # Groq API Key (for Whisper voice transcription - no content filtering)
+    # Get one free at: https://console.groq.com/keys
+    "GROQ_API_KEY": _str("GROQ_API_KEY"),
 
-# Notion Contacts Database ID (for persistent contact storage)
-NOTION_CONTACTS_DB_ID = clean_env_value(os.getenv("NOTION_CONTACTS_DB_ID"))
+    # AI Mode: Set to "smart" to use Claude for all input processing
+    "AI_MODE": lambda: clean_env_value(os.getenv("AI_MODE") or "basic").lower(),
 
-# Your Telegram user ID (for security - only you can use the bot)
-# Get this by messaging @userinfobot on Telegram
-ALLOWED_USER_IDS = [int(id.strip()) for id in os.getenv("ALLOWED_USER_IDS", "").split(",") if id.strip()]
+    # Claude model for conversational AI (default: sonnet for reliable tool use)
+    "CLAUDE_MODEL": _str("CLAUDE_MODEL", "claude-sonnet-4-5-20250929"),
 
-# Reminder check interval in minutes
-REMINDER_CHECK_INTERVAL = int(os.getenv("REMINDER_CHECK_INTERVAL", "5"))
+    # Agent settings
+    "AGENT_MAX_TURNS": _int("AGENT_MAX_TURNS", "5"),
+    "CONVERSATION_HISTORY_LIMIT": _int("CONVERSATION_HISTORY_LIMIT", "20"),
 
-# Email inbox check interval in minutes (for new email notifications)
-EMAIL_CHECK_INTERVAL = int(os.getenv("EMAIL_CHECK_INTERVAL", "2"))
+    # GitHub Integration (for creating issues on your repos via Telegram)
+    # Personal access token with 'repo' scope: https://github.com/settings/tokens
+    "GITHUB_TOKEN": _str("GITHUB_TOKEN"),
+    "GITHUB_OWNER": _str("GITHUB_OWNER", "mindfulcrumb"),
 
-# Anthropic API Key for Claude AI (optional - enables smart mode)
-ANTHROPIC_API_KEY = clean_env_value(os.getenv("ANTHROPIC_API_KEY"))
+    # Claude model for AI categorization (default: sonnet for accuracy)
+    "CLAUDE_CATEGORIZER_MODEL": _str("CLAUDE_CATEGORIZER_MODEL", "claude-sonnet-4-5-20250929"),
 
-# Groq API Key (for Whisper voice transcription - no content filtering)
-# Get one free at: https://console.groq.com/keys
-GROQ_API_KEY = clean_env_value(os.getenv("GROQ_API_KEY"))
+    # Email Configuration
+    # Option 1: Agentmail (recommended for AI agents)
+    # Get API key from agentmail.to dashboard
+    "AGENTMAIL_API_KEY": _str("AGENTMAIL_API_KEY"),
+    "AGENTMAIL_INBOX": _str("AGENTMAIL_INBOX"),  # e.g., marlene@agentmail.to
 
-# AI Mode: Set to "smart" to use Claude for all input processing
-AI_MODE = clean_env_value(os.getenv("AI_MODE") or "basic").lower()
+    # Option 2: SMTP (Gmail, etc.)
+    # For Gmail: enable 2FA, create App Password at https://myaccount.google.com/apppasswords
+    "SMTP_EMAIL": _str("SMTP_EMAIL"),
+    "SMTP_PASSWORD": _str("SMTP_PASSWORD"),
+    "SMTP_HOST": _str("SMTP_HOST", "smtp.gmail.com"),
+    "SMTP_PORT": _int("SMTP_PORT", "587"),
 
-# Claude model for conversational AI (default: sonnet for reliable tool use)
-CLAUDE_MODEL = clean_env_value(os.getenv("CLAUDE_MODEL")) or "claude-sonnet-4-5-20250929"
+    # WhatsApp via Twilio
+    # Get credentials at: https://console.twilio.com
+    # For sandbox, TWILIO_WHATSAPP_FROM is like: +14155238886
+    "TWILIO_ACCOUNT_SID": _str("TWILIO_ACCOUNT_SID"),
+    "TWILIO_AUTH_TOKEN": _str("TWILIO_AUTH_TOKEN"),
+    "TWILIO_WHATSAPP_FROM": _str("TWILIO_WHATSAPP_FROM"),
 
-# Agent settings
-AGENT_MAX_TURNS = int(os.getenv("AGENT_MAX_TURNS", "5"))
-CONVERSATION_HISTORY_LIMIT = int(os.getenv("CONVERSATION_HISTORY_LIMIT", "20"))
+    # Proactive Features
+    # Daily briefing: sends task summary at this hour (in your timezone)
+    "BRIEFING_HOUR": _int("BRIEFING_HOUR", "8"),
+    "BRIEFING_MINUTE": _int("BRIEFING_MINUTE", "0"),
 
-# GitHub Integration (for creating issues on your repos via Telegram)
-# Personal access token with 'repo' scope: https://github.com/settings/tokens
-GITHUB_TOKEN = clean_env_value(os.getenv("GITHUB_TOKEN"))
-GITHUB_OWNER = clean_env_value(os.getenv("GITHUB_OWNER")) or "mindfulcrumb"
+    # Timezone for scheduled jobs (e.g., "Europe/Lisbon", "America/New_York")
+    # See: https://en.wikipedia.org/wiki/List_of_tz_database_time_zones
+    "TIMEZONE": _str("TIMEZONE"),
 
-# Claude model for AI categorization (default: sonnet for accuracy)
-CLAUDE_CATEGORIZER_MODEL = clean_env_value(os.getenv("CLAUDE_CATEGORIZER_MODEL")) or "claude-sonnet-4-5-20250929"
+    # Smart nudges: how often to check for overdue/stale tasks (in hours)
+    "NUDGE_INTERVAL_HOURS": _int("NUDGE_INTERVAL_HOURS", "6"),
 
-# Email Configuration
-# Option 1: Agentmail (recommended for AI agents)
-# Get API key from agentmail.to dashboard
-AGENTMAIL_API_KEY = clean_env_value(os.getenv("AGENTMAIL_API_KEY"))
-AGENTMAIL_INBOX = clean_env_value(os.getenv("AGENTMAIL_INBOX"))  # e.g., marlene@agentmail.to
+    # Contact book for quick references (name -> email/phone)
+    # Format: "john:john@email.com,mom:+1234567890"
+    "CONTACTS_RAW": _str("CONTACTS"),
+    "CONTACTS": _contacts,
+}
 
-# Option 2: SMTP (Gmail, etc.)
-# For Gmail: enable 2FA, create App Password at https://myaccount.google.com/apppasswords
-SMTP_EMAIL = clean_env_value(os.getenv("SMTP_EMAIL"))
-SMTP_PASSWORD = clean_env_value(os.getenv("SMTP_PASSWORD"))
-SMTP_HOST = clean_env_value(os.getenv("SMTP_HOST")) or "smtp.gmail.com"
-SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
 
-# WhatsApp via Twilio
-# Get credentials at: https://console.twilio.com
-# For sandbox, TWILIO_WHATSAPP_FROM is like: +14155238886
-TWILIO_ACCOUNT_SID = clean_env_value(os.getenv("TWILIO_ACCOUNT_SID"))
-TWILIO_AUTH_TOKEN = clean_env_value(os.getenv("TWILIO_AUTH_TOKEN"))
-TWILIO_WHATSAPP_FROM = clean_env_value(os.getenv("TWILIO_WHATSAPP_FROM"))
+def _setting(name):
+    """Parse a setting on first use and keep it as a module attribute."""
+    module_vars = globals()
+    if name not in module_vars:
+        module_vars[name] = _SETTINGS[name]()
+    return module_vars[name]
 
-# Proactive Features
-# Daily briefing: sends task summary at this hour (in your timezone)
-BRIEFING_HOUR = int(os.getenv("BRIEFING_HOUR", "8"))
-BRIEFING_MINUTE = int(os.getenv("BRIEFING_MINUTE", "0"))
 
-# Timezone for scheduled jobs (e.g., "Europe/Lisbon", "America/New_York")
-# See: https://en.wikipedia.org/wiki/List_of_tz_database_time_zones
-TIMEZONE = clean_env_value(os.getenv("TIMEZONE")) or ""
+def __getattr__(name):
+    if name not in _SETTINGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return _setting(name)
 
-# Smart nudges: how often to check for overdue/stale tasks (in hours)
-NUDGE_INTERVAL_HOURS = int(os.getenv("NUDGE_INTERVAL_HOURS", "6"))
 
-# Contact book for quick references (name -> email/phone)
-# Format: "john:john@email.com,mom:+1234567890"
-CONTACTS_RAW = clean_env_value(os.getenv("CONTACTS", ""))
-CONTACTS = {}
-if CONTACTS_RAW:
-    for pair in CONTACTS_RAW.split(","):
-        if ":" in pair:
-            name, value = pair.split(":", 1)
-            CONTACTS[name.strip().lower()] = value.strip()
+def __dir__():
+    return sorted(set(globals()) | set(_SETTINGS))
@@ -1,17 +1,52 @@
 """Script to create the Tasks database in Notion."""
 import os
+import re
 import sys
-from notion_client import Client
-from dotenv import load_dotenv
+from functools import cache
+
+# A Notion page ID, bare (32 hex digits) or formatted as a UUID
+_PAGE_ID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{32}")
+
+# Select options for the Tasks database
+_STATUS_OPTIONS = (
+    {"name": "To Do", "color": "gray"},
+    {"name": "In Progress", "color": "blue"},
+    {"name": "Done", "color": "green"},
+)
+_CATEGORY_OPTIONS = (
+    {"name": "Personal", "color": "purple"},
+    {"name": "Business", "color": "orange"},
+)
+_PRIORITY_OPTIONS = (
+    {"name": "High", "color": "red"},
+    {"name": "Medium", "color": "yellow"},
+    {"name": "Low", "color": "gray"},
+)
+
+
+# dotenv and the Notion SDK are imported on first use, so a usage error
+# doesn't load them
+@cache
+def get_notion_token() -> str:
+    """NOTION_TOKEN from the environment, loading .env the first time."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return os.getenv("NOTION_TOKEN") or ""
+
+
+@cache
+def get_client():
+    """Notion client for the setup scripts, shared by every database they create."""
+    from notion_client import Client
+
+    # Newer API versions keep database properties on data sources, and
+    # silently create databases without the properties given here
+    return Client(auth=get_notion_token(), notion_version="2022-06-28")
 
-load_dotenv()
-
-NOTION_TOKEN = os.getenv("NOTION_TOKEN")
 
 def create_tasks_database(parent_page_id: str):
     """Create the Tasks database with all required properties."""
-
-    client = Client(auth=NOTION_TOKEN)
+    client = get_client()
 
     print("Creating Tasks database...")
 
@@ -23,30 +58,13 @@ def create_tasks_database(parent_page_id: str):
                 "title": {}
             },
             "Status": {
-                "select": {
-                    "options": [
-                        {"name": "To Do", "color": "gray"},
-                        {"name": "In Progress", "color": "blue"},
-                        {"name": "Done", "color": "green"}
-                    ]
-                }
+                "select": {"options": list(_STATUS_OPTIONS)}
             },
             "Category": {
-                "select": {
-                    "options": [
-                        {"name": "Personal", "color": "purple"},
-                        {"name": "Business", "color": "orange"}
-                    ]
-                }
+                "select": {"options": list(_CATEGORY_OPTIONS)}
             },
             "Priority": {
-                "select": {
-                    "options": [
-                        {"name": "High", "color": "red"},
-                        {"name": "Medium", "color": "yellow"},
-                        {"name": "Low", "color": "gray"}
-                    ]
-                }
+                "select": {"options": list(_PRIORITY_OPTIONS)}
             },
             "Due Date": {
                 "date": {}
@@ -72,11 +90,11 @@ def extract_page_id(url_or_id: str) -> str:
     if "notion.so" in url_or_id or "notion.site" in url_or_id:
         # URL format: https://www.notion.so/Page-Name-abc123def456
         # or: https://www.notion.so/workspace/abc123def456
-        parts = url_or_id.rstrip("/").split("-")
-        if len(parts) > 1:
-            page_id = parts[-1].split("?")[0]
-        else:
-            page_id = url_or_id.split("/")[-1].split("?")[0]
+        # The page ID is the last one in the path; a ?v= query holds a view ID
+        ids = _PAGE_ID_RE.findall(url_or_id.partition("?")[0])
+        if not ids:
+            return url_or_id
+        page_id = ids[-1]
 
         # Format as UUID if needed (add hyphens)
         if len(page_id) == 32:
@@ -88,10 +106,6 @@ def extract_page_id(url_or_id: str) -> str:
 
 
 if __name__ == "__main__":
-    if not NOTION_TOKEN:
-        print("❌ Error: NOTION_TOKEN not set in .env file")
-        sys.exit(1)
-
     if len(sys.argv) < 2:
         print("Usage: python setup_notion.py <page_url_or_id>")
         print("\nExample:")
@@ -99,6 +113,10 @@ if __name__ == "__main__":
         print("  python setup_notion.py abc123def456")
         sys.exit(1)
 
+    if not get_notion_token():
+        print("❌ Error: NOTION_TOKEN not set in .env file")
+        sys.exit(1)
+
     page_input = sys.argv[1]
     page_id = extract_page_id(page_input)
 